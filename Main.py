@@ -7,6 +7,7 @@ Implementa:
  - Reglas: Original (posición importa), Orden libre
  - Regla opcional "Dado bonus" (relanzar no-coincidentes una vez)
  - Interfaz de consola interactiva
+ - Modo por lotes sin interacción (CSV / JSONL), ver `python Main.py --help`
 
 Autores originales del diseño: Juan José Areiza Orrego & Andres Felipe Martinez Taborda
 Versión: Monte Carlo removido por petición del usuario.
@@ -14,153 +15,11 @@ Versión: Monte Carlo removido por petición del usuario.
 
 import random
 
-# -------------------------
-# Utilidades básicas
-# -------------------------
-def roll_dice(n):
-    """Lanza n dados (1..6) y devuelve lista de resultados."""
-    return [random.randint(1,6) for _ in range(n)]
-
-def unique_choice(values, k):
-    """Genera elección aleatoria de k números únicos (1..6)."""
-    return random.sample(values, k)
-
-# -------------------------
-# Conteo de aciertos
-# -------------------------
-def matches_original(chosen, roll):
-    """
-    Cuenta coincidencias en el modo 'original' (la posición importa).
-    Retorna número de aciertos por posición exacta (0..len(chosen)).
-    """
-    return sum(1 for c, r in zip(chosen, roll) if c == r)
-
-def matches_order_free(chosen, roll):
-    """
-    Cuenta cuántos de los números elegidos aparecen al menos una vez en el lanzamiento.
-    (Ej: elegido {1,2,3,4}, tirada [1,1,2,3] -> 3 aciertos).
-    """
-    chosen_set = set(chosen)
-    roll_set = set(roll)
-    return sum(1 for x in chosen_set if x in roll_set)
-
-# -------------------------
-# Aplicar regla 'bonus' (reroll non-matches once)
-# -------------------------
-def apply_bonus(chosen, roll, mode, match_fn):
-    """
-    Aplica la regla 'dado bonus' que permite relanzar los dados que no coincidieron
-    (según la función match_fn que cuenta coincidencias) y devuelve la nueva cantidad
-    de coincidencias tras el relanzamiento junto con la nueva tirada.
-    """
-    n = len(chosen)
-    new_roll = roll.copy()
-    for i in range(n):
-        # para original y para la simplificación aplicada a order_free relanzamos por posición
-        if chosen[i] != roll[i]:
-            new_roll[i] = random.randint(1,6)
-    return match_fn(chosen, new_roll), new_roll
-
-# -------------------------
-# Texto de premio según modo
-# -------------------------
-def prize_text_mode_2(matches):
-    """Etiqueta de premio para modo 2 (original/order-free/bonus)."""
-    if matches == 2:
-        return "Primer premio (mayor)"
-    elif matches == 1:
-        return "Segundo premio"
-    else:
-        return "Perdedor"
-
-def prize_text_mode_4(matches):
-    """Etiqueta de premio para modo 4 (original/order-free/bonus)."""
-    if matches == 4:
-        return "Premio mayor (4 aciertos)"
-    elif matches == 3:
-        return "Segundo premio (3 aciertos)"
-    elif matches == 2:
-        return "Tercer premio (2 aciertos)"
-    else:
-        return "Perdedor (0-1 aciertos)"
-
-# -------------------------
-# Simulación de un solo ensayo (incluye elección del jugador y reglas)
-# -------------------------
-def single_game(chosen, mode=2, rule="original", apply_bonus_flag=False):
-    """
-    Ejecuta un solo juego:
-      - chosen: lista de números (len 2 or 4), sin repetidos.
-      - mode: 2 o 4
-      - rule: "original" o "order_free"
-      - apply_bonus_flag: si True se aplica el bonus (se relanzan no-coincidentes)
-    Devuelve dict con roll inicial, matches inicial, (si hubo relanzamiento) nuevo roll y matches, y etiqueta de premio final.
-    """
-    n = mode
-    roll = roll_dice(n)
-    match_fn = matches_original if rule == "original" else matches_order_free
-    matches_initial = match_fn(chosen, roll)
-
-    if apply_bonus_flag:
-        matches_after, new_roll = apply_bonus(chosen, roll, mode, match_fn)
-        final_matches = matches_after
-        final_roll = new_roll
-    else:
-        final_matches = matches_initial
-        final_roll = roll
-
-    prize = prize_text_mode_2(final_matches) if mode == 2 else prize_text_mode_4(final_matches)
-
-    return {
-        "chosen": chosen,
-        "roll_initial": roll,
-        "matches_initial": matches_initial,
-        "applied_bonus": apply_bonus_flag,
-        "roll_final": final_roll,
-        "matches_final": final_matches,
-        "prize": prize
-    }
-
-# -------------------------
-# Probabilidades teóricas (valores tomados del entregable 1)
-# (Se conservan aquí para referencia y mostrar al usuario)
-# -------------------------
-THEORETICAL = {
-    "2_original": {
-        "Primer premio (mayor)": 1/36,
-        "Segundo premio": 10/36,
-        "Perdedor": 25/36
-    },
-    "2_order_free": {
-        "Primer premio (mayor)": 2/36,
-        "Segundo premio": 18/36,
-        "Perdedor": 16/36
-    },
-    "2_bonus": {
-        "Primer premio (mayor)": (1/36) + (10/36)*(1/6),
-        "Segundo premio": (10/36) - (10/36)*(1/6),
-        "Perdedor": 25/36
-    },
-    "4_original": {
-        "Premio mayor (4 aciertos)": 1/1296,
-        "Segundo premio (3 aciertos)": 20/1296,
-        "Tercer premio (2 aciertos)": 150/1296,
-        "Perdedor (0-1 aciertos)": 1125/1296
-    },
-    "4_order_free": {
-        "Premio mayor (4 aciertos)": 24/1296,
-        "Segundo premio (3 aciertos)": 336/1296,
-        "Tercer premio (2 aciertos)": 660/1296,
-        "Perdedor (0-1 aciertos)": (260+16)/1296
-    },
-    "4_bonus": {
-        # Valores aproximados según el entregable
-        "Premio mayor (4 aciertos)": 0.0087169,
-        "Segundo premio (3 aciertos)": 0.079244,
-        "Tercer premio (2 aciertos)": 0.270151,
-        "Perdedor (0-1 aciertos)": 0.6418889  # aproximación
-    }
-}
+# La lógica del juego (tiradas, aciertos, bonus, premios) vive en dados_fortuna_core,
+# que no importa tkinter ni numpy; se reexporta aquí para los usos existentes.
+from dados_fortuna_core import (ORDINAL_PRIZES, apply_bonus, default_prize_tiers, matches_order_free,
+                                matches_original, prize_from_tiers, prize_labels, prize_text,
+                                prize_text_mode_2, prize_text_mode_4, roll_dice, single_game, unique_choice)
 
 # -------------------------
 # Interfaz de consola (simple, sin Monte Carlo)
@@ -237,37 +96,189 @@ def interactive_mode():
         print("Tirada final (sin bonus):", result["roll_final"], "-> coincidencias finales:", result["matches_final"])
     print("Resultado:", result["prize"])
 
-    # Mostrar probabilidades teóricas del entregable para referencia
-    print("\nProbabilidades teóricas (referencia del Entregable 1):")
-    key = f"{mode}_{'order_free' if rule == 'order_free' else 'original'}"
-    if apply_bonus_flag:
-        key = f"{mode}_bonus" if f"{mode}_bonus" in THEORETICAL else key + "_bonus"
-    # Ajustar claves para acceso seguro
-    if mode == 2:
-        if apply_bonus_flag:
-            for k, v in THEORETICAL["2_bonus"].items():
-                print(f"  {k:25s}: {v:.6f}")
-        elif rule == "original":
-            for k, v in THEORETICAL["2_original"].items():
-                print(f"  {k:25s}: {v:.6f}")
-        else:
-            for k, v in THEORETICAL["2_order_free"].items():
-                print(f"  {k:25s}: {v:.6f}")
-    else:  # mode 4
-        if apply_bonus_flag:
-            for k, v in THEORETICAL["4_bonus"].items():
-                print(f"  {k:25s}: {v:.6f}")
-        elif rule == "original":
-            for k, v in THEORETICAL["4_original"].items():
-                print(f"  {k:25s}: {v:.6f}")
-        else:
-            for k, v in THEORETICAL["4_order_free"].items():
-                print(f"  {k:25s}: {v:.6f}")
+    # Mostrar probabilidades teóricas exactas para referencia
+    from dados_fortuna_cache import cached_theoretical
+    print("\nProbabilidades teóricas (exactas):")
+    for k, v in cached_theoretical(mode, rule, apply_bonus_flag).items():
+        print(f"  {k:25s}: {v:.6f}")
 
     print("\nGracias por jugar")
 
+# -------------------------
+# Modo por lotes sin interacción (CSV / JSONL en streaming)
+# -------------------------
+CSV_FIELDS = ["game", "chosen", "roll_initial", "matches_initial", "applied_bonus", "roll_final", "matches_final", "prize"]
+BATCH_CHUNK = 100_000
+
+def iter_batches(chosen, mode, rule, bonus, n_games, seed=None, chunk_size=BATCH_CHUNK):
+    """Genera lotes de `simulate_batch` de a lo sumo `chunk_size` juegos hasta completar `n_games`."""
+    import numpy as np
+    from dados_fortuna_batch import simulate_batch
+
+    rng = np.random.default_rng(seed)
+    remaining = n_games
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield simulate_batch(chosen, mode, rule, bonus, size, rng)
+        remaining -= size
+
+def iter_games(batches):
+    """Aplana lotes en dicts por juego con las claves de `single_game` (más el número de juego)."""
+    game = 0
+    for batch in batches:
+        mode = len(batch["chosen"])
+        labels = prize_labels(mode)
+        columns = zip(batch["roll_initial"].tolist(), batch["matches_initial"].tolist(),
+                      batch["roll_final"].tolist(), batch["matches_final"].tolist(),
+                      batch["prize_index"].tolist())
+        for roll, matches_initial, roll_final, matches_final, prize in columns:
+            game += 1
+            yield {
+                "game": game,
+                "chosen": batch["chosen"],
+                "roll_initial": roll,
+                "matches_initial": matches_initial,
+                "applied_bonus": batch["applied_bonus"],
+                "roll_final": roll_final,
+                "matches_final": matches_final,
+                "prize": labels[prize],
+            }
+
+def iter_aggregates(batches, mode):
+    """Emite un resumen acumulado (conteos y frecuencias por premio) tras cada lote."""
+    from dados_fortuna_stats import GameStats
+
+    stats = GameStats(mode)
+    for batch in batches:
+        stats.add_batch(batch)
+        row = {"games": stats.n}
+        for label, count in zip(stats.labels, stats.prize_counts):
+            row[label] = count
+        for label, freq in stats.proportions().items():
+            row[f"{label} (frec.)"] = freq
+        yield row
+
+def write_rows(rows, fmt, out):
+    """Escribe filas (dicts) en streaming como CSV o JSONL."""
+    import csv
+    import json
+
+    writer = None
+    for row in rows:
+        if fmt == "jsonl":
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            continue
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow({k: " ".join(map(str, v)) if isinstance(v, list) else v for k, v in row.items()})
+
+def parse_chosen(text, n, rng=random):
+    """Interpreta '3 5' o 'auto' como elección de n números únicos entre 1 y 6."""
+    if text.strip().lower() == "auto":
+        return rng.sample(range(1, 7), n)
+    nums = [int(p) for p in text.replace(",", " ").split()]
+    if len(nums) != n:
+        raise ValueError(f"Debes ingresar exactamente {n} números.")
+    if any(x < 1 or x > 6 for x in nums):
+        raise ValueError("Los números deben estar entre 1 y 6.")
+    if len(set(nums)) != n:
+        raise ValueError("No se permiten repetidos; selecciona números únicos.")
+    return nums
+
+def iter_rounds(choices, mode, rule, bonus, n_rounds, seed=None, chunk_size=BATCH_CHUNK):
+    """
+    Genera resultados de `play_round` por bloques hasta completar `n_rounds` rondas;
+    cada bloque tiene a lo sumo `chunk_size` jugadas (rondas x jugadores).
+    """
+    import numpy as np
+    from dados_fortuna_round import play_round
+
+    rng = np.random.default_rng(seed)
+    step = max(1, chunk_size // len(choices))
+    remaining = n_rounds
+    while remaining > 0:
+        size = min(step, remaining)
+        yield play_round(choices, mode, rule, bonus, rng, size)
+        remaining -= size
+
+def round_mode(args, out):
+    """Juega `--rounds` rondas para los jugadores de `--players` con el motor matricial."""
+    from dados_fortuna_round import iter_rows, read_players
+
+    players = read_players(args.players)
+    if not players:
+        raise ValueError(f"No hay jugadores en {args.players}")
+    names = [name or f"Jugador {i + 1}" for i, (name, _) in enumerate(players)]
+    results = iter_rounds([values for _, values in players], args.mode, args.rule, args.bonus,
+                          args.rounds, args.seed)
+
+    def rows():
+        first = 1
+        for result in results:
+            yield from iter_rows(result, names, first)
+            first += len(result["roll_initial"])
+
+    write_rows(rows(), args.format, out)
+
+def batch_mode(args, out=None):
+    """Ejecuta el modo por lotes con los argumentos ya parseados."""
+    import sys
+
+    out = out or sys.stdout
+    if args.players:
+        round_mode(args, out)
+        return
+    chosen = parse_chosen(args.chosen, args.mode, random.Random(args.seed))
+    batches = iter_batches(chosen, args.mode, args.rule, args.bonus, args.games, args.seed,
+                           args.aggregate_every or BATCH_CHUNK)
+    rows = iter_aggregates(batches, args.mode) if args.aggregate_every else iter_games(batches)
+    write_rows(rows, args.format, out)
+
+def main(argv=None):
+    """Sin --games ni --players abre la consola interactiva; si no, corre el modo por lotes."""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Los Dados de la Fortuna")
+    parser.add_argument("--games", type=int, help="número de juegos (activa el modo por lotes)")
+    parser.add_argument("--mode", type=int, choices=[2, 4], default=2)
+    parser.add_argument("--rule", choices=["original", "order_free"], default="original")
+    parser.add_argument("--bonus", action="store_true", help="aplicar la regla 'Dado bonus'")
+    parser.add_argument("--chosen", default="auto", help="números elegidos, p. ej. '3 5', o 'auto'")
+    parser.add_argument("--seed", type=int, help="semilla para reproducir la corrida")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--aggregate-every", type=int, metavar="N",
+                        help="emitir sólo resúmenes acumulados cada N juegos")
+    parser.add_argument("--players", metavar="ARCHIVO",
+                        help="jugar rondas para los jugadores del archivo ('Nombre; 1 2' por línea)")
+    parser.add_argument("--rounds", type=int, default=1, help="rondas a jugar con --players")
+    args = parser.parse_args(argv)
+    for option, value in (("--games", args.games), ("--aggregate-every", args.aggregate_every),
+                          ("--rounds", args.rounds)):
+        if value is not None and value < 1:
+            parser.error(f"{option} debe ser al menos 1")
+    if args.players is not None:
+        for option, value in (("--games", args.games), ("--aggregate-every", args.aggregate_every)):
+            if value is not None:
+                parser.error(f"{option} no se puede combinar con --players (usa --rounds)")
+    from dados_fortuna_instrument import install_from_env
+    install_from_env()
+
+    if args.games is None and args.players is None:
+        interactive_mode()
+        return 0
+    try:
+        batch_mode(args)
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # salida cortada por el consumidor (p. ej. `| head`)
+        sys.stderr.close()
+    return 0
+
 # -------------------------
 # Si se ejecuta como script
 # -------------------------
 if __name__ == "__main__":
-    interactive_mode()
+    main()
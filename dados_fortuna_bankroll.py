@@ -0,0 +1,180 @@
+"""
+dados_fortuna_bankroll.py
+Apuestas, pagos y simulación de sesiones (bankroll) para "Los dados de la fortuna".
+
+Las etiquetas de premio no tienen valor monetario; aquí cada premio recibe un
+pago (múltiplo bruto de la apuesta: 0 = se pierde la apuesta, 1 = se recupera)
+y se analizan:
+
+ - `round_analytics`: valor esperado exacto por ronda, ventaja de la casa y
+   varianza, a partir de `dados_fortuna_exact`.
+ - `simulate_sessions`: miles de sesiones de muchas rondas, vectorizadas por
+   bloques de rondas (memoria constante por sesión). Reporta saldo final,
+   ganancia media por ronda, ruina (saldo menor que la apuesta), máxima caída
+   (drawdown) y, opcionalmente, algunas trayectorias de ejemplo.
+
+Los resultados de cada ronda se muestrean de la distribución exacta de premios
+(engine="exact") o jugando los dados con `simulate_batch` (engine="dice").
+"""
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels
+from dados_fortuna_exact import exact_distribution
+from dados_fortuna_stats import wilson_interval
+
+CHUNK_ROUNDS = 256
+
+# Pagos por defecto (múltiplos brutos de la apuesta) por (modo, regla, bonus):
+# la regla y el bonus cambian mucho las probabilidades, así que cada tabla está
+# calibrada para su configuración (ventaja de la casa de 2.7-3.7% con 2 dados
+# y de 6.4-7.9% con 4 dados)
+_PAYOUT_TABLES = {
+    (2, "original", False): (15, 2),
+    (2, "original", True): (3.5, 1.5),
+    (2, "order_free", False): (4, 1.5),
+    (2, "order_free", True): (3.5, 1),
+    (4, "original", False): (500, 20, 2),
+    (4, "original", True): (40, 4, 1),
+    (4, "order_free", False): (8, 2, 0.5),
+    (4, "order_free", True): (12, 1, 0.5),
+}
+DEFAULT_PAYOUTS = {
+    key: dict(zip(prize_labels(key[0]), table + (0,))) for key, table in _PAYOUT_TABLES.items()
+}
+
+# -------------------------
+# Tablas de pago
+# -------------------------
+def default_payouts(mode, rule="original", bonus=False):
+    """Copia de la tabla de pagos por defecto de la configuración."""
+    try:
+        return dict(DEFAULT_PAYOUTS[mode, rule, bool(bonus)])
+    except KeyError:
+        raise ValueError(f"Sin pagos por defecto para modo={mode!r}, regla={rule!r}") from None
+
+def payout_vector(mode, payouts=None, rule="original", bonus=False):
+    """
+    Arreglo de pagos en el orden de `prize_labels(mode)`; sin `payouts` se usa
+    la tabla por defecto de (mode, rule, bonus). Falta una etiqueta -> ValueError.
+    """
+    payouts = default_payouts(mode, rule, bonus) if payouts is None else payouts
+    missing = [label for label in prize_labels(mode) if label not in payouts]
+    if missing:
+        raise ValueError(f"Faltan pagos para: {', '.join(missing)}")
+    return np.array([float(payouts[label]) for label in prize_labels(mode)])
+
+# -------------------------
+# Analítica exacta
+# -------------------------
+def round_analytics(mode=2, rule="original", bonus=False, stake=1.0, payouts=None):
+    """
+    Valor esperado exacto de una ronda con apuesta `stake`.
+    Devuelve dict con expected_return (pago bruto esperado), expected_value
+    (ganancia neta esperada), house_edge (-EV / apuesta), variance y std de la
+    ganancia neta, y la distribución usada.
+    """
+    probs = np.array([float(p) for p in exact_distribution(mode, rule, bonus).values()])
+    net = stake * (payout_vector(mode, payouts, rule, bonus) - 1)
+    ev = float(probs @ net)
+    variance = float(probs @ (net - ev) ** 2)
+    return {
+        "expected_return": ev + stake,
+        "expected_value": ev,
+        "house_edge": -ev / stake,
+        "variance": variance,
+        "std": variance ** 0.5,
+        "distribution": dict(zip(prize_labels(mode), probs.tolist())),
+    }
+
+# -------------------------
+# Simulación de sesiones
+# -------------------------
+def _round_outcomes(mode, rule, bonus, shape, probs, rng, engine):
+    """Índices de premio (sesiones x rondas) para un bloque."""
+    if engine == "exact":
+        return rng.choice(len(probs), size=shape, p=probs)
+    from dados_fortuna_batch import simulate_batch
+
+    batch = simulate_batch(list(range(1, mode + 1)), mode, rule, bonus, shape[0] * shape[1], rng)
+    return batch["prize_index"].reshape(shape)
+
+def simulate_sessions(n_sessions=1000, n_rounds=100, mode=2, rule="original", bonus=False,
+                      stake=1.0, bankroll=50.0, payouts=None, stop_at_ruin=True,
+                      sample_paths=0, engine="exact", chunk_rounds=CHUNK_ROUNDS, rng=None, z=1.96):
+    """
+    Simula `n_sessions` sesiones de hasta `n_rounds` rondas con saldo inicial `bankroll`.
+      - stake: apuesta fija por ronda; payouts: etiqueta -> múltiplo bruto de la apuesta
+        (None: tabla por defecto de la configuración, ver DEFAULT_PAYOUTS).
+      - stop_at_ruin: una sesión se detiene cuando el saldo no alcanza para apostar;
+        si es False sigue jugando (saldo negativo = crédito) y la ruina sólo se registra.
+      - sample_paths: cuántas sesiones (las primeras) guardan su trayectoria completa.
+      - engine: "exact" (muestreo de la distribución exacta) o "dice" (`simulate_batch`).
+      - chunk_rounds: rondas simuladas por bloque; la memoria es O(sesiones x bloque).
+    Devuelve dict con el resumen (ver claves) y el arreglo `final` de saldos.
+    """
+    if engine not in ("exact", "dice"):
+        raise ValueError(f"Motor desconocido: {engine!r}")
+    rng = np.random.default_rng() if rng is None else rng
+    probs = np.array([float(p) for p in exact_distribution(mode, rule, bonus).values()])
+    net_by_prize = stake * (payout_vector(mode, payouts, rule, bonus) - 1)
+
+    balance = np.full(n_sessions, float(bankroll))
+    peak = balance.copy()
+    max_drawdown = np.zeros(n_sessions)
+    rounds_played = np.zeros(n_sessions, dtype=np.int64)
+    ruined = balance < stake  # un saldo inicial que no alcanza para apostar ya es ruina
+    paths = np.empty((min(sample_paths, n_sessions), n_rounds + 1))
+    paths[:, 0] = bankroll
+
+    done = 0
+    while done < n_rounds:
+        size = min(chunk_rounds, n_rounds - done)
+        net = net_by_prize[_round_outcomes(mode, rule, bonus, (n_sessions, size), probs, rng, engine)]
+        active = np.ones((n_sessions, size), dtype=bool)
+        if stop_at_ruin:
+            active[ruined] = False
+        path = balance[:, None] + np.cumsum(np.where(active, net, 0.0), axis=1)
+        below = path < stake
+        hit = below.any(axis=1) & ~ruined
+        if stop_at_ruin:
+            # se anulan las rondas posteriores a la primera en que el saldo no alcanza para apostar
+            first = np.where(hit, below.argmax(axis=1), size)
+            active &= np.arange(size)[None, :] <= first[:, None]
+        ruined |= hit
+        net = np.where(active, net, 0.0)
+        path = balance[:, None] + np.cumsum(net, axis=1)
+
+        running_peak = np.maximum(peak[:, None], np.maximum.accumulate(path, axis=1))
+        max_drawdown = np.maximum(max_drawdown, (running_peak - path).max(axis=1))
+        peak = running_peak[:, -1]
+        rounds_played += active.sum(axis=1)
+        if len(paths):
+            paths[:, done + 1:done + 1 + size] = path[:len(paths)]
+        balance = path[:, -1]
+        done += size
+
+    analytics = round_analytics(mode, rule, bonus, stake, payouts)
+    total_rounds = int(rounds_played.sum())
+    empirical_ev = float((balance - bankroll).sum() / total_rounds) if total_rounds else 0.0
+    n_ruined = int(ruined.sum())
+    return {
+        "n_sessions": n_sessions,
+        "n_rounds": n_rounds,
+        "stake": stake,
+        "bankroll": bankroll,
+        "final": balance,
+        "mean_final": float(balance.mean()),
+        "expected_value": analytics["expected_value"],
+        "house_edge": analytics["house_edge"],
+        "empirical_ev": empirical_ev,
+        "empirical_house_edge": -empirical_ev / stake,
+        "risk_of_ruin": n_ruined / n_sessions,
+        "risk_of_ruin_interval": wilson_interval(n_ruined, n_sessions, z),
+        "mean_rounds_played": float(rounds_played.mean()),
+        "max_drawdown_mean": float(max_drawdown.mean()),
+        "max_drawdown_p50": float(np.percentile(max_drawdown, 50)),
+        "max_drawdown_p95": float(np.percentile(max_drawdown, 95)),
+        "max_drawdown_max": float(max_drawdown.max()),
+        "paths": paths,
+    }
@@ -0,0 +1,82 @@
+"""
+dados_fortuna_batch.py
+Motor por lotes (vectorizado) para "Los dados de la fortuna".
+
+Equivalente en distribución a `Main.single_game` + `Main.apply_bonus`, pero
+lanza todos los juegos de una vez como arreglos de NumPy en lugar de un juego
+por llamada:
+ - La matriz completa de tiradas (n_games x mode) se genera de un solo golpe.
+ - Los aciertos iniciales/finales y el índice de premio se calculan en forma
+   de arreglo.
+"""
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels, prize_text
+from dados_fortuna_kernels import matches_order_free_batch, matches_original_batch
+
+# -------------------------
+# Tablas de premios
+# -------------------------
+def prize_index_table(mode):
+    """
+    Arreglo que mapea número de aciertos (0..mode) -> índice en `prize_labels(mode)`.
+    """
+    labels = prize_labels(mode)
+    return np.array([labels.index(prize_text(mode, m)) for m in range(mode + 1)], dtype=np.int8)
+
+# -------------------------
+# Conteo de aciertos vectorizado
+# -------------------------
+def batch_matches(chosen, rolls, rule="original"):
+    """
+    Cuenta aciertos para cada fila de `rolls` (matriz n_games x mode).
+      - "original": coincidencia de valor y posición.
+      - "order_free": cuántos números elegidos aparecen al menos una vez.
+    """
+    if rule == "original":
+        return matches_original_batch(chosen, rolls)
+    return matches_order_free_batch(chosen, rolls)
+
+# -------------------------
+# Simulación por lotes
+# -------------------------
+def simulate_batch(chosen, mode=2, rule="original", bonus=False, n_games=1, rng=None):
+    """
+    Simula `n_games` juegos con la misma elección `chosen`.
+      - chosen: lista de números (len == mode), sin repetidos.
+      - mode: 2 o 4
+      - rule: "original" o "order_free"
+      - bonus: si True se relanzan (una vez) los dados que no coinciden por posición,
+               igual que `Main.apply_bonus`.
+      - rng: `numpy.random.Generator` opcional (por defecto uno nuevo sin semilla).
+    Devuelve dict de arreglos con las mismas claves que `single_game`
+    (roll_initial, matches_initial, roll_final, matches_final) más prize_index,
+    índice en `prize_labels(mode)`.
+    """
+    if len(chosen) != mode:
+        raise ValueError(f"Se esperaban {mode} números elegidos, se recibieron {len(chosen)}")
+    rng = np.random.default_rng() if rng is None else rng
+
+    rolls = rng.integers(1, 7, size=(n_games, mode), dtype=np.int8)
+    matches_initial = batch_matches(chosen, rolls, rule)
+
+    if bonus:
+        # relanzamos por posición, igual que apply_bonus (también en order_free)
+        rerolls = rng.integers(1, 7, size=(n_games, mode), dtype=np.int8)
+        mismatch = rolls != np.asarray(chosen, dtype=np.int8)
+        final_rolls = np.where(mismatch, rerolls, rolls)
+        matches_final = batch_matches(chosen, final_rolls, rule)
+    else:
+        final_rolls = rolls
+        matches_final = matches_initial
+
+    return {
+        "chosen": list(chosen),
+        "roll_initial": rolls,
+        "matches_initial": matches_initial,
+        "applied_bonus": bonus,
+        "roll_final": final_rolls,
+        "matches_final": matches_final,
+        "prize_index": prize_index_table(mode)[matches_final],
+    }
@@ -0,0 +1,352 @@
+"""
+dados_fortuna_bench.py
+Benchmarks de los caminos críticos de "Los dados de la fortuna" (sin GUI).
+
+Mide roll_dice, matches_original, matches_order_free, apply_bonus y single_game
+para todos los modos y reglas, además de los backends de dados, los núcleos por
+tabla, el motor de rondas multijugador, el motor por lotes y (opcional) el
+driver multinúcleo. Por caso reporta latencia por
+llamada (mínimo y p50/p90/p99) y juegos/llamadas por segundo.
+
+Uso:
+    python dados_fortuna_bench.py                      # mide e imprime
+    python dados_fortuna_bench.py --save base.json     # guarda línea base
+    python dados_fortuna_bench.py --compare base.json  # marca regresiones (> --threshold)
+    python dados_fortuna_bench.py --imports            # presupuesto de tiempo de importación
+
+Una corrida completa combina 3 procesos independientes (--processes). Con
+--compare (sólo corridas completas, sin --quick) se compara el mínimo de las
+muestras de cada caso y el código de salida es 1 si alguno empeora más que el
+umbral;
+con --imports, si algún módulo excede su presupuesto o carga un módulo prohibido.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import dados_fortuna_core as core
+import dados_fortuna_kernels as kernels
+from dados_fortuna_batch import simulate_batch
+from dados_fortuna_parallel import simulate_parallel
+from dados_fortuna_rng import BACKENDS, make_rng
+from dados_fortuna_round import play_round
+
+MODES = (2, 4)
+RULES = ("original", "order_free")
+DEFAULT_THRESHOLD = 0.20
+
+# módulo -> (segundos de importación tolerados, módulos que no debe cargar).
+# El núcleo y la CLI deben arrancar sin tkinter ni numpy; las GUIs, sin numpy.
+IMPORT_BUDGETS = {
+    "dados_fortuna_core": (0.05, ("tkinter", "numpy")),
+    "Main": (0.05, ("tkinter", "numpy")),
+    "dados_fortuna_gui": (0.25, ("numpy",)),
+    "dados_fortuna_2": (0.25, ("numpy",)),
+}
+IMPORT_RUNS = 5
+GUI_MODULES = ("dados_fortuna_gui", "dados_fortuna_2")  # se omiten si falta tkinter o pantalla
+
+# -------------------------
+# Medición
+# -------------------------
+def sample(fn, inner, repeat):
+    """Latencias por llamada (s) de `repeat` muestras de `inner` llamadas, con el GC desactivado (como timeit)."""
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(inner):
+                fn()
+            samples.append((time.perf_counter() - start) / inner)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+def summarize(samples, inner, items_per_call=1):
+    """
+    Latencia por llamada (mínimo y p50/p90/p99, en segundos), elementos por
+    segundo según la mediana, e `inner`/`repeat` usados.
+    """
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99]).tolist()
+    return {"min": min(samples), "p50": p50, "p90": p90, "p99": p99,
+            "per_second": items_per_call / p50, "inner": inner, "repeat": len(samples)}
+
+def measure(fn, inner, repeat, items_per_call=1):
+    """Ejecuta `fn` `inner` veces por muestra, `repeat` muestras; ver `summarize`."""
+    return summarize(sample(fn, inner, repeat), inner, items_per_call)
+
+def bench_cases(quick=False, parallel=False):
+    """Genera (nombre, fn, inner, items_por_llamada) para cada caso de benchmark."""
+    inner = 200 if quick else 2000
+    batch_games = 20_000 if quick else 200_000
+    for mode in MODES:
+        chosen = list(range(1, mode + 1))
+        roll = core.roll_dice(mode)
+        yield f"roll_dice/{mode}", lambda m=mode: core.roll_dice(m), inner, 1
+        for backend in BACKENDS:
+            yield (f"roll_dice/{mode}/{backend}",
+                   lambda m=mode, g=make_rng(backend, 0): core.roll_dice(m, rng=g), inner, mode)
+        yield f"matches_original/{mode}", lambda r=roll, c=chosen: core.matches_original(c, r), inner, 1
+        yield f"matches_order_free/{mode}", lambda r=roll, c=chosen: core.matches_order_free(c, r), inner, 1
+        yield f"kernels.matches_original/{mode}", lambda r=roll, c=chosen: kernels.matches_original(c, r), inner, 1
+        yield f"kernels.matches_order_free/{mode}", lambda r=roll, c=chosen: kernels.matches_order_free(c, r), inner, 1
+        for players in (1, 1000):
+            table = [chosen] * players
+            yield (f"play_round/{mode}/{players}",
+                   lambda t=table, g=np.random.default_rng(0): play_round(t, rule="order_free", bonus=True, rng=g),
+                   max(1, inner // 10), players)
+        for rule in RULES:
+            match_fn = core.matches_original if rule == "original" else core.matches_order_free
+            yield (f"apply_bonus/{mode}/{rule}",
+                   lambda r=roll, c=chosen, m=mode, f=match_fn: core.apply_bonus(c, r, m, f), inner, 1)
+            for bonus in (False, True):
+                suffix = f"{mode}/{rule}/{'bonus' if bonus else 'plain'}"
+                yield (f"single_game/{suffix}",
+                       lambda c=chosen, m=mode, r=rule, b=bonus: core.single_game(c, m, r, b), inner, 1)
+                rng = np.random.default_rng(0)
+                yield (f"simulate_batch/{suffix}",
+                       lambda c=chosen, m=mode, r=rule, b=bonus, g=rng: simulate_batch(c, m, r, b, batch_games, g),
+                       1, batch_games)
+                if parallel:
+                    yield (f"simulate_parallel/{suffix}",
+                           lambda c=chosen, m=mode, r=rule, b=bonus: simulate_parallel(c, m, r, b, 10 * batch_games, seed=0),
+                           1, 10 * batch_games)
+
+def run_benchmarks(quick=False, parallel=False, repeat=None, passes=None):
+    """
+    Ejecuta todos los casos y devuelve dict serializable con resultados y metadatos.
+    Las `repeat` muestras de cada caso se toman en `passes` pasadas intercaladas
+    sobre toda la lista, para que una racha de ruido del sistema no afecte a un
+    solo caso entero.
+    """
+    repeat = repeat or (5 if quick else 15)
+    passes = passes or (1 if quick else 3)
+    cases = list(bench_cases(quick, parallel))
+    samples = {name: [] for name, _, _, _ in cases}
+    for name, fn, _, _ in cases:
+        fn()  # calentamiento (tablas perezosas, cachés)
+    for i in range(passes):
+        per_pass = repeat // passes + (1 if i < repeat % passes else 0)
+        for name, fn, inner, _ in cases:
+            samples[name].extend(sample(fn, inner, per_pass))
+    results = {name: summarize(samples[name], inner, items) for name, _, inner, items in cases}
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": quick,
+            "parallel": parallel,
+            "repeat": repeat,
+            "passes": passes,
+        },
+        "results": results,
+    }
+
+def run_in_processes(quick=False, parallel=False, processes=3):
+    """
+    Corre `run_benchmarks` en `processes` intérpretes nuevos y combina los resultados.
+    La velocidad de un mismo código varía bastante entre procesos (ubicación en
+    memoria, frecuencia del CPU), así que por caso se toma el mínimo de los
+    mínimos y la mediana de los percentiles.
+    """
+    reports = []
+    for _ in range(processes):
+        cmd = [sys.executable, os.path.abspath(__file__), "--processes", "1", "--raw"]
+        cmd += ["--quick"] * quick + ["--parallel"] * parallel
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        reports.append(json.loads(proc.stdout))
+    results = {}
+    for name in reports[0]["results"]:
+        runs = [report["results"][name] for report in reports]
+        merged = {key: float(np.median([run[key] for run in runs])) for key in ("p50", "p90", "p99")}
+        merged["min"] = min(run["min"] for run in runs)
+        merged["per_second"] = runs[0]["per_second"] * runs[0]["p50"] / merged["p50"]
+        merged["inner"] = runs[0]["inner"]
+        merged["repeat"] = sum(run["repeat"] for run in runs)
+        results[name] = merged
+    meta = dict(reports[0]["meta"], processes=processes)
+    return {"meta": meta, "results": results}
+
+# -------------------------
+# Línea base y regresiones
+# -------------------------
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara latencias contra una línea base usando el mínimo de las muestras
+    (la medida menos sensible al ruido del sistema; p50 si la base es antigua y
+    no lo tiene). Devuelve lista de (nombre, base, actual, cambio_relativo) que
+    empeoran más que `threshold`.
+    """
+    regressions = []
+    for name, res in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        key = "min" if "min" in base and "min" in res else "p50"
+        change = res[key] / base[key] - 1
+        if change > threshold:
+            regressions.append((name, base[key], res[key], change))
+    return regressions
+
+def settings_mismatch(current, baseline):
+    """Avisos (lista de textos) si la línea base se midió con otros ajustes que la corrida actual."""
+    warnings = []
+    for key in ("quick", "parallel", "repeat", "passes", "processes", "python", "numpy"):
+        if key in baseline["meta"] and baseline["meta"][key] != current["meta"].get(key):
+            warnings.append(f"{key}: base {baseline['meta'][key]!r}, actual {current['meta'].get(key)!r}")
+    for name, res in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is not None and "inner" in base and base["inner"] != res["inner"]:
+            warnings.append(f"{name}: inner base {base['inner']}, actual {res['inner']}")
+    return warnings
+
+# -------------------------
+# Presupuesto de importación
+# -------------------------
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": sorted(m for m in {forbidden!r} if m in sys.modules)}}))
+"""
+
+def _missing_gui_support(stderr):
+    """True si el fallo de importación se debe sólo a que falta tkinter o una pantalla."""
+    last = stderr.strip().splitlines()[-1] if stderr.strip() else ""
+    return (re.match(r"(ModuleNotFoundError|ImportError): No module named '_?tkinter'", last) is not None
+            or (last.startswith("_tkinter.TclError") and "display" in last))
+
+def measure_import(module, forbidden=(), runs=IMPORT_RUNS):
+    """
+    Importa `module` en `runs` intérpretes nuevos (sin cachés de módulos del proceso).
+    Devuelve dict con la mediana del tiempo de importación (s) y los módulos
+    prohibidos que quedaron cargados; si la importación falla, dict con "error"
+    (stderr del intérprete) y "gui_missing" (el fallo es sólo por falta de
+    tkinter o de pantalla).
+    """
+    times, loaded = [], set()
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(module=module, forbidden=tuple(forbidden))],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip(), "gui_missing": _missing_gui_support(proc.stderr)}
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        times.append(probe["elapsed"])
+        loaded.update(probe["loaded"])
+    return {"elapsed": float(np.median(times)), "loaded": sorted(loaded)}
+
+def check_imports(budgets=IMPORT_BUDGETS, runs=IMPORT_RUNS):
+    """
+    Lista de (módulo, medición, presupuesto, ok) para cada entrada de `budgets`.
+    Un fallo de importación sólo se omite (ok) en las GUIs y sólo si falta tkinter
+    o pantalla; cualquier otro error hace fallar la verificación.
+    """
+    rows = []
+    for module, (budget, forbidden) in budgets.items():
+        res = measure_import(module, forbidden, runs)
+        if "error" in res:
+            ok = module in GUI_MODULES and res["gui_missing"]
+        else:
+            ok = res["elapsed"] <= budget and not res["loaded"]
+        rows.append((module, res, budget, ok))
+    return rows
+
+def format_imports(rows):
+    lines = [f"{'módulo':25s} {'importación':>12s} {'presupuesto':>12s}  estado"]
+    for module, res, budget, ok in rows:
+        if "error" in res:
+            if ok:
+                lines.append(f"{module:25s} {'-':>12s} {budget * 1e3:10.1f}ms  omitido (sin tkinter/pantalla)")
+            else:
+                lines.append(f"{module:25s} {'-':>12s} {budget * 1e3:10.1f}ms  ERROR al importar:")
+                lines.extend("    " + line for line in res["error"].splitlines())
+            continue
+        status = "ok" if ok else "EXCEDIDO"
+        if res["loaded"]:
+            status += f" (carga {', '.join(res['loaded'])})"
+        lines.append(f"{module:25s} {res['elapsed'] * 1e3:10.1f}ms {budget * 1e3:10.1f}ms  {status}")
+    return "\n".join(lines)
+
+def format_results(report):
+    lines = [f"{'caso':45s} {'p50':>11s} {'p90':>11s} {'p99':>11s} {'por seg':>14s}"]
+    for name, res in report["results"].items():
+        lines.append(
+            f"{name:45s} {res['p50'] * 1e6:9.2f}us {res['p90'] * 1e6:9.2f}us "
+            f"{res['p99'] * 1e6:9.2f}us {res['per_second']:14,.0f}"
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de Los Dados de la Fortuna")
+    parser.add_argument("--quick", action="store_true", help="menos repeticiones (humo)")
+    parser.add_argument("--parallel", action="store_true", help="incluir el driver multinúcleo")
+    parser.add_argument("--save", metavar="JSON", help="guardar resultados como línea base")
+    parser.add_argument("--compare", metavar="JSON", help="comparar contra una línea base")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="empeoramiento relativo del mínimo tolerado (default 0.20)")
+    parser.add_argument("--processes", type=int,
+                        help="procesos independientes a combinar (default 3; 1 con --quick)")
+    parser.add_argument("--raw", action="store_true", help=argparse.SUPPRESS)  # salida JSON para run_in_processes
+    parser.add_argument("--imports", action="store_true",
+                        help="sólo verificar el presupuesto de tiempo de importación")
+    args = parser.parse_args(argv)
+
+    if args.processes is not None and args.processes < 1:
+        parser.error("--processes debe ser al menos 1")
+    if args.imports:
+        rows = check_imports()
+        print(format_imports(rows))
+        return 0 if all(ok for _, _, _, ok in rows) else 1
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if args.quick or baseline["meta"].get("quick"):
+            # 5 muestras por caso no alcanzan para distinguir un 20% del ruido
+            parser.error("--compare requiere corridas completas (sin --quick), tanto la actual como la línea base")
+
+    processes = args.processes or (1 if args.quick else 3)
+    if processes > 1:
+        report = run_in_processes(args.quick, args.parallel, processes)
+    else:
+        report = run_benchmarks(quick=args.quick, parallel=args.parallel)
+        report["meta"]["processes"] = 1
+    if args.raw:
+        json.dump(report, sys.stdout)
+        return 0
+    print(format_results(report))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nLínea base guardada en {args.save}")
+
+    if baseline is not None:
+        for warning in settings_mismatch(report, baseline):
+            print(f"Aviso: ajustes distintos a la línea base ({warning})", file=sys.stderr)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegresiones (> {args.threshold:.0%}):")
+            for name, base, now, change in regressions:
+                print(f"  {name:45s} {base * 1e6:9.2f}us -> {now * 1e6:9.2f}us (+{change:.0%})")
+            return 1
+        print(f"\nSin regresiones respecto a {args.compare} (umbral {args.threshold:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+dados_fortuna_cache.py
+Caché de distribuciones de premios (memoria + disco) para "Los dados de la fortuna".
+
+Cada script recalculaba las distribuciones exactas al arrancar. `DistributionCache`
+las guarda con dos niveles:
+
+ - memoria: LRU (OrderedDict) de a lo sumo `max_entries` entradas;
+ - disco: un archivo JSON por entrada en `DADOS_FORTUNA_CACHE_DIR` (por defecto
+   ~/.cache/dados_fortuna), con desalojo de los menos usados (mtime) cuando el
+   total supera `max_bytes`. Las escrituras son atómicas (`os.replace`).
+
+La clave es (dados, caras, regla, variante de bonus, elección canónica,
+versión del motor). Al cambiar ENGINE_VERSION las entradas viejas dejan de
+coincidir y se borran del disco en el primer acceso. Las probabilidades se
+guardan como fracciones "p/q", así que la caché no pierde exactitud.
+
+Con DADOS_FORTUNA_CACHE_DIR="" no se usa disco (sólo memoria); los errores de
+E/S (p. ej. directorio de sólo lectura) también degradan a sólo memoria.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from fractions import Fraction
+
+ENGINE_VERSION = "1"
+MAX_MEMORY_ENTRIES = 128
+MAX_DISK_BYTES = 4 * 1024 * 1024
+BONUS_VARIANTS = ("none", "reroll")
+# nombre de los archivos propios (sha1 de la clave): el resto del directorio no se toca
+_ENTRY_NAME = re.compile(r"^[0-9a-f]{40}\.json$")
+
+def default_cache_dir():
+    """Directorio de la caché en disco ("" o None = deshabilitada)."""
+    env = os.environ.get("DADOS_FORTUNA_CACHE_DIR")
+    if env is not None:
+        return env or None
+    return os.path.join(os.path.expanduser("~"), ".cache", "dados_fortuna")
+
+# -------------------------
+# Claves
+# -------------------------
+def bonus_variant(bonus):
+    """Normaliza la variante de bonus: False -> "none", True -> "reroll" (`Main.apply_bonus`)."""
+    if bonus in (False, None):
+        return "none"
+    if bonus is True:
+        return "reroll"
+    if bonus not in BONUS_VARIANTS:
+        raise ValueError(f"Variante de bonus desconocida: {bonus!r}")
+    return bonus
+
+def canonical_chosen(n_dice, rule, chosen=None):
+    """
+    Forma canónica de la elección: con números distintos la distribución no
+    depende de cuáles se elijan, así que todas se reducen a (1, ..., n). Con
+    repetidos se conserva la tupla (ordenada en orden libre, donde la posición no importa).
+    """
+    if chosen is None or len(set(chosen)) == len(chosen):
+        return tuple(range(1, n_dice + 1))
+    return tuple(sorted(chosen)) if rule == "order_free" else tuple(chosen)
+
+def distribution_key(n_dice, faces=6, rule="original", bonus=False, chosen=None, version=ENGINE_VERSION):
+    """Clave completa de una distribución (tupla serializable)."""
+    return (n_dice, faces, rule, bonus_variant(bonus), canonical_chosen(n_dice, rule, chosen), version)
+
+# -------------------------
+# Caché de dos niveles
+# -------------------------
+class DistributionCache:
+    """LRU en memoria respaldada por un almacén JSON en disco de tamaño acotado."""
+
+    def __init__(self, directory=None, max_entries=MAX_MEMORY_ENTRIES, max_bytes=MAX_DISK_BYTES,
+                 version=ENGINE_VERSION):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = version
+        self._memory = OrderedDict()
+        self._purged = False
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # --- memoria ---
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # --- disco ---
+    def _path(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _entries(self):
+        """(ruta, tamaño, mtime) de los archivos de la caché (sólo los propios, `_ENTRY_NAME`)."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if _ENTRY_NAME.match(name):
+                path = os.path.join(self.directory, name)
+                st = os.stat(path)
+                entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _purge_stale(self):
+        """Borra (una vez por proceso) las entradas de otras versiones del motor."""
+        self._purged = True
+        for path, _, _ in self._entries():
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                stale = not isinstance(data, dict) or data.get("version") != self.version
+            except (OSError, ValueError):
+                stale = True
+            if stale:
+                os.remove(path)
+
+    def _evict(self):
+        """Desaloja los archivos menos usados hasta quedar por debajo de `max_bytes`."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        try:
+            if not self._purged and os.path.isdir(self.directory):
+                self._purge_stale()
+            path = self._path(key)
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if not isinstance(data, dict) or data.get("key") != json.loads(json.dumps(key)):
+                return None  # colisión de hash o archivo ajeno
+            os.utime(path)  # marca de uso para el desalojo LRU
+            return {label: Fraction(p) for label, p in data["value"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, ZeroDivisionError):
+            # archivo corrupto o con otra forma: se trata como ausente
+            return None
+
+    def _store(self, key, value):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            data = {"key": key, "version": self.version,
+                    "value": {label: f"{p.numerator}/{p.denominator}" for label, p in value.items()}}
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._evict()
+        except OSError:
+            pass  # sin disco utilizable: la caché queda sólo en memoria
+
+    # --- API ---
+    def get(self, key):
+        """Valor cacheado (dict etiqueta -> Fraction) o None."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        value = self._load(key)
+        if value is not None:
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        self._store(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Devuelve el valor de `key`, calculándolo con `compute()` (y guardándolo) si falta."""
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, disk=True):
+        """Vacía la memoria y, si `disk`, borra los archivos de la caché."""
+        self._memory.clear()
+        if disk and self.directory and os.path.isdir(self.directory):
+            for path, _, _ in self._entries():
+                os.remove(path)
+
+_cache = None
+
+def get_cache():
+    """Caché compartida del proceso (directorio según `default_cache_dir`)."""
+    global _cache
+    if _cache is None:
+        _cache = DistributionCache(default_cache_dir())
+    return _cache
+
+# -------------------------
+# Distribuciones cacheadas
+# -------------------------
+def _compute(n_dice, faces, rule, variant, chosen):
+    if faces == 6 and n_dice in (2, 4):
+        from dados_fortuna_exact import exact_distribution
+
+        return exact_distribution(n_dice, rule, variant == "reroll", chosen)
+    from dados_fortuna_general import exact_distribution_general
+
+    return exact_distribution_general(n_dice, faces, rule, variant == "reroll")
+
+def cached_distribution(mode=2, rule="original", bonus=False, faces=6, chosen=None, cache=None):
+    """Distribución exacta (etiqueta -> Fraction) a través de la caché."""
+    cache = cache or get_cache()
+    key = distribution_key(mode, faces, rule, bonus, chosen, cache.version)
+    return cache.get_or_compute(key, lambda: _compute(mode, faces, rule, key[3], key[4]))
+
+def cached_theoretical(mode=2, rule="original", bonus=False, faces=6, chosen=None, cache=None):
+    """Igual que `cached_distribution` pero en float, para mostrar al usuario."""
+    return {label: float(p) for label, p in cached_distribution(mode, rule, bonus, faces, chosen, cache).items()}
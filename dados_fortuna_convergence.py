@@ -0,0 +1,160 @@
+"""
+dados_fortuna_convergence.py
+Panel de convergencia Monte Carlo en vivo para la GUI.
+
+Un hilo trabajador (`MonteCarloWorker`) simula por bloques la configuración
+elegida con el motor por lotes y publica instantáneas de un `GameStats` en una
+cola. El panel (`ConvergencePanel`) la consulta con `root.after` a ritmo
+limitado (REDRAW_MS) y muestra, junto a la probabilidad teórica, la frecuencia
+empírica y su intervalo de Wilson. El bucle de Tk nunca ejecuta simulación.
+"""
+
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from dados_fortuna_batch import simulate_batch
+from dados_fortuna_policy import simulate_proportional_batch
+from dados_fortuna_stats import GameStats
+
+REDRAW_MS = 250
+CHUNK_GAMES = 50_000
+Z_95 = 1.96
+
+# -------------------------
+# Hilo de simulación
+# -------------------------
+class MonteCarloWorker(threading.Thread):
+    """
+    Simula (modo, regla, bonus) hasta que se llame a `stop` y publica instantáneas en `snapshots`.
+    bonus="proportional" usa el Dado Bonus proporcional de dados_fortuna_2 con la política óptima.
+    """
+
+    def __init__(self, mode, rule, bonus, chunk=CHUNK_GAMES, seed=None):
+        super().__init__(daemon=True)
+        self.mode = mode
+        self.rule = rule
+        self.bonus = bonus
+        self.chunk = chunk
+        self.rng = np.random.default_rng(seed)
+        self.snapshots = queue.Queue()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        stats = GameStats(self.mode)
+        chosen = list(range(1, self.mode + 1))
+        start = time.perf_counter()
+        while not self._stop_event.is_set():
+            if self.bonus == "proportional":
+                batch = simulate_proportional_batch(chosen, self.mode, self.chunk, self.rng)
+            else:
+                batch = simulate_batch(chosen, self.mode, self.rule, self.bonus, self.chunk, self.rng)
+            stats.add_batch(batch)
+            self.snapshots.put({
+                "n": stats.n,
+                "elapsed": time.perf_counter() - start,
+                "proportions": stats.proportions(),
+                "intervals": stats.wilson_intervals(Z_95),
+            })
+            time.sleep(0.001)  # cede el GIL al hilo de Tk entre bloques
+
+# -------------------------
+# Panel Tk
+# -------------------------
+class ConvergencePanel:
+    """
+    Tabla teórica vs. empírica que se actualiza mientras corre la simulación.
+      - get_config: callable sin argumentos -> (mode, rule, bonus, theoretical_dict)
+    """
+
+    def __init__(self, parent, root, get_config):
+        self.root = root
+        self.get_config = get_config
+        self.worker = None
+        self._job = None
+
+        self.frame = tk.LabelFrame(parent, text="Convergencia Monte Carlo", bg="#f5f5f5", font=("Arial", 12, "bold"))
+        self.frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        columns = ("teorica", "empirica", "ic", "error")
+        self.tree = ttk.Treeview(self.frame, columns=columns, height=4)
+        self.tree.heading("#0", text="Premio")
+        self.tree.heading("teorica", text="Teórica")
+        self.tree.heading("empirica", text="Empírica")
+        self.tree.heading("ic", text="IC 95% (Wilson)")
+        self.tree.heading("error", text="Dif.")
+        self.tree.column("#0", width=220)
+        for col, width in zip(columns, (90, 90, 170, 90)):
+            self.tree.column(col, width=width, anchor="e")
+        self.tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+        bottom = tk.Frame(self.frame, bg="#f5f5f5")
+        bottom.pack(fill="x", padx=5, pady=(0, 5))
+        self.status = tk.Label(bottom, text="Detenido", bg="#f5f5f5", anchor="w")
+        self.status.pack(side="left", fill="x", expand=True)
+        self.toggle_btn = ttk.Button(bottom, text="▶ Iniciar", command=self.toggle)
+        self.toggle_btn.pack(side="right")
+
+    @property
+    def running(self):
+        return self.worker is not None
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self):
+        """Arranca (o reinicia) la simulación con la configuración actual."""
+        self.stop()
+        mode, rule, bonus, self.theoretical = self.get_config()
+        self.tree.delete(*self.tree.get_children())
+        for label, p in self.theoretical.items():
+            self.tree.insert("", "end", iid=label, text=label, values=(f"{p:.5f}", "", "", ""))
+        self.worker = MonteCarloWorker(mode, rule, bonus)
+        self.worker.start()
+        self.toggle_btn.config(text="■ Detener")
+        self._job = self.root.after(REDRAW_MS, self._poll)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+            self.toggle_btn.config(text="▶ Iniciar")
+            self.status.config(text=self.status.cget("text").replace("Simulando", "Detenido"))
+
+    def _poll(self):
+        # Sólo se dibuja la instantánea más reciente (redibujo limitado a REDRAW_MS)
+        snapshot = None
+        try:
+            while True:
+                snapshot = self.worker.snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        if snapshot is not None:
+            self._draw(snapshot)
+        self._job = self.root.after(REDRAW_MS, self._poll)
+
+    def _draw(self, snapshot):
+        for label, freq in snapshot["proportions"].items():
+            lo, hi = snapshot["intervals"][label]
+            diff = freq - self.theoretical.get(label, float("nan"))
+            self.tree.item(label, values=(
+                f"{self.theoretical.get(label, float('nan')):.5f}",
+                f"{freq:.5f}",
+                f"[{lo:.5f}, {hi:.5f}]",
+                f"{diff:+.5f}",
+            ))
+        rate = snapshot["n"] / snapshot["elapsed"] if snapshot["elapsed"] else 0
+        self.status.config(text=f"Simulando: {snapshot['n']:,} juegos ({rate:,.0f} juegos/s)")
@@ -0,0 +1,206 @@
+"""
+dados_fortuna_core.py
+Núcleo sin interfaz de "Los dados de la fortuna": tiradas, conteo de aciertos,
+regla "Dado bonus", premios y un juego completo (`single_game`), más la tabla de
+probabilidades teóricas que muestran las GUIs.
+
+No importa tkinter ni numpy (y la tabla teórica se calcula sólo al pedirla), así
+que los scripts de consola, los workers de simulación y las pruebas arrancan en
+milisegundos y funcionan en máquinas sin pantalla. `Main` reexporta estas
+funciones; ver `python dados_fortuna_bench.py --imports` para el presupuesto
+de tiempo de importación.
+"""
+
+from functools import lru_cache
+
+from dados_fortuna_rng import get_default_rng
+
+# -------------------------
+# Utilidades básicas
+# -------------------------
+def roll_dice(n, faces=6, rng=None):
+    """
+    Lanza n dados (1..faces, por defecto 1..6) y devuelve lista de resultados.
+    rng: generador de `dados_fortuna_rng` (por defecto el compartido).
+    """
+    return (rng or get_default_rng()).roll(n, faces)
+
+def unique_choice(values, k, rng=None):
+    """Genera elección aleatoria de k números únicos (p. ej. de 1..6)."""
+    return (rng or get_default_rng()).sample(values, k)
+
+# -------------------------
+# Conteo de aciertos
+# -------------------------
+def matches_original(chosen, roll):
+    """
+    Cuenta coincidencias en el modo 'original' (la posición importa).
+    Retorna número de aciertos por posición exacta (0..len(chosen)).
+    """
+    return sum(1 for c, r in zip(chosen, roll) if c == r)
+
+def matches_order_free(chosen, roll):
+    """
+    Cuenta cuántos de los números elegidos aparecen al menos una vez en el lanzamiento.
+    (Ej: elegido {1,2,3,4}, tirada [1,1,2,3] -> 3 aciertos).
+    """
+    chosen_set = set(chosen)
+    roll_set = set(roll)
+    return sum(1 for x in chosen_set if x in roll_set)
+
+# -------------------------
+# Aplicar regla 'bonus' (reroll non-matches once)
+# -------------------------
+def apply_bonus(chosen, roll, mode, match_fn, faces=6, rng=None):
+    """
+    Aplica la regla 'dado bonus' que permite relanzar los dados que no coincidieron
+    (según la función match_fn que cuenta coincidencias) y devuelve la nueva cantidad
+    de coincidencias tras el relanzamiento junto con la nueva tirada.
+    """
+    n = len(chosen)
+    new_roll = roll.copy()
+    # para original y para la simplificación aplicada a order_free relanzamos por posición
+    misses = [i for i in range(n) if chosen[i] != roll[i]]
+    for i, value in zip(misses, roll_dice(len(misses), faces, rng)):
+        new_roll[i] = value
+    return match_fn(chosen, new_roll), new_roll
+
+# -------------------------
+# Texto de premio según modo
+# -------------------------
+def prize_text_mode_2(matches):
+    """Etiqueta de premio para modo 2 (original/order-free/bonus)."""
+    if matches == 2:
+        return "Primer premio (mayor)"
+    elif matches == 1:
+        return "Segundo premio"
+    else:
+        return "Perdedor"
+
+def prize_text_mode_4(matches):
+    """Etiqueta de premio para modo 4 (original/order-free/bonus)."""
+    if matches == 4:
+        return "Premio mayor (4 aciertos)"
+    elif matches == 3:
+        return "Segundo premio (3 aciertos)"
+    elif matches == 2:
+        return "Tercer premio (2 aciertos)"
+    else:
+        return "Perdedor (0-1 aciertos)"
+
+ORDINAL_PRIZES = ["Premio mayor", "Segundo premio", "Tercer premio", "Cuarto premio", "Quinto premio", "Sexto premio"]
+
+def default_prize_tiers(mode):
+    """
+    Escalones de premio por defecto para `mode` dados: lista de (mínimo de aciertos, etiqueta)
+    de mayor a menor. Para 2 y 4 dados reproduce `prize_text_mode_2` / `prize_text_mode_4`;
+    en general premia desde la mitad de los dados (redondeando hacia arriba).
+    """
+    if mode == 2:
+        return [(2, prize_text_mode_2(2)), (1, prize_text_mode_2(1)), (0, prize_text_mode_2(0))]
+    threshold = max(1, (mode + 1) // 2)
+    tiers = []
+    for i, m in enumerate(range(mode, threshold - 1, -1)):
+        name = ORDINAL_PRIZES[i] if i < len(ORDINAL_PRIZES) else f"Premio {i + 1}"
+        tiers.append((m, f"{name} ({m} aciertos)"))
+    loser = "Perdedor (0 aciertos)" if threshold == 1 else f"Perdedor (0-{threshold - 1} aciertos)"
+    tiers.append((0, loser))
+    return tiers
+
+def prize_from_tiers(matches, tiers):
+    """Etiqueta del primer escalón (de mayor a menor) cuyo mínimo de aciertos se alcanza."""
+    for min_matches, label in tiers:
+        if matches >= min_matches:
+            return label
+    return tiers[-1][1]
+
+def prize_text(mode, matches, tiers=None):
+    """Etiqueta de premio según el modo (2 o 4 dados) o según escalones configurables."""
+    if tiers is None:
+        if mode == 2:
+            return prize_text_mode_2(matches)
+        if mode == 4:
+            return prize_text_mode_4(matches)
+        tiers = default_prize_tiers(mode)
+    return prize_from_tiers(matches, tiers)
+
+def prize_labels(mode, tiers=None):
+    """
+    Etiquetas de premio del modo, ordenadas de mayor a menor premio y sin repetir
+    (en modo 4 "Perdedor (0-1 aciertos)" cubre 0 y 1 aciertos).
+    """
+    labels = []
+    for m in range(mode, -1, -1):
+        label = prize_text(mode, m, tiers)
+        if label not in labels:
+            labels.append(label)
+    return labels
+
+# -------------------------
+# Simulación de un solo ensayo (incluye elección del jugador y reglas)
+# -------------------------
+def single_game(chosen, mode=2, rule="original", apply_bonus_flag=False, faces=6, tiers=None, rng=None):
+    """
+    Ejecuta un solo juego:
+      - chosen: lista de números (len == mode), sin repetidos.
+      - mode: número de dados (2 o 4 en el juego original)
+      - rule: "original" o "order_free"
+      - apply_bonus_flag: si True se aplica el bonus (se relanzan no-coincidentes)
+      - faces: caras por dado (6 por defecto)
+      - tiers: escalones de premio (ver `default_prize_tiers`); None usa los del modo
+      - rng: generador de `dados_fortuna_rng` (por defecto el compartido)
+    Devuelve dict con roll inicial, matches inicial, (si hubo relanzamiento) nuevo roll y matches, y etiqueta de premio final.
+    """
+    n = mode
+    roll = roll_dice(n, faces, rng)
+    match_fn = matches_original if rule == "original" else matches_order_free
+    matches_initial = match_fn(chosen, roll)
+
+    if apply_bonus_flag:
+        matches_after, new_roll = apply_bonus(chosen, roll, mode, match_fn, faces, rng)
+        final_matches = matches_after
+        final_roll = new_roll
+    else:
+        final_matches = matches_initial
+        final_roll = roll
+
+    prize = prize_text(mode, final_matches, tiers)
+
+    return {
+        "chosen": chosen,
+        "roll_initial": roll,
+        "matches_initial": matches_initial,
+        "applied_bonus": apply_bonus_flag,
+        "roll_final": final_roll,
+        "matches_final": final_matches,
+        "prize": prize
+    }
+
+# -------------------------
+# Reglas de las GUIs y probabilidades teóricas
+# -------------------------
+GUI_RULES = ("Original", "Orden Libre", "Dado Bonus")
+
+def gui_rule(rule_selected):
+    """(regla, bonus) de una opción del combo de las GUIs; "Dado Bonus" compara como 'original'."""
+    if rule_selected not in GUI_RULES:
+        raise ValueError(f"Regla desconocida: {rule_selected!r}")
+    return ("order_free" if rule_selected == "Orden Libre" else "original"), rule_selected == "Dado Bonus"
+
+@lru_cache(maxsize=None)
+def _theoretical_table():
+    from dados_fortuna_cache import cached_theoretical
+
+    table = {}
+    for mode in (2, 4):
+        for rule_selected in GUI_RULES:
+            table[f"{mode}_{rule_selected}"] = cached_theoretical(mode, *gui_rule(rule_selected))
+    return table
+
+def theoretical_table():
+    """
+    Probabilidades exactas por "modo_regla" (p. ej. "4_Orden Libre"), como en las GUIs.
+    Se calculan (o leen de `dados_fortuna_cache`) en la primera llamada; se
+    devuelve una copia que el llamador puede modificar.
+    """
+    return dict(_theoretical_table())
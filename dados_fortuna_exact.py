@@ -0,0 +1,75 @@
+"""
+dados_fortuna_exact.py
+Distribuciones exactas de premios para "Los dados de la fortuna".
+
+Reemplaza las tablas THEORETICAL escritas a mano: enumera el espacio completo
+de 6^n tiradas y, con la regla "dado bonus", el espacio de relanzamientos,
+para cada combinación (modo, regla, bonus). Las probabilidades se devuelven
+como `Fraction` sobre las etiquetas de `prize_text_mode_2` / `prize_text_mode_4`.
+
+El relanzamiento de `apply_bonus` sustituye cada dado no coincidente por un
+valor nuevo uniforme, así que la tirada final sólo depende de *qué* posiciones
+coincidieron (una máscara), no de los valores fallidos. Se agrupan las 6^n
+tiradas iniciales por máscara y se enumeran 6^k relanzamientos por máscara:
+en modo 4 son 1296 + 7^4 casos en lugar de 1296 * 1296.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from itertools import product
+
+from dados_fortuna_core import matches_original, matches_order_free, prize_labels, prize_text
+
+FACES = range(1, 7)
+
+# -------------------------
+# Enumeración exacta
+# -------------------------
+@lru_cache(maxsize=None)
+def _exact_counts(chosen, rule, bonus):
+    """
+    Cuenta casos favorables por etiqueta de premio sobre un denominador común.
+    Devuelve (dict etiqueta -> casos, denominador).
+    """
+    mode = len(chosen)
+    match_fn = matches_original if rule == "original" else matches_order_free
+    counts = {label: 0 for label in prize_labels(mode)}
+
+    if not bonus:
+        for roll in product(FACES, repeat=mode):
+            counts[prize_text(mode, match_fn(chosen, roll))] += 1
+        return counts, 6 ** mode
+
+    # Agrupar tiradas iniciales por máscara de posiciones no coincidentes
+    mask_counts = {}
+    for roll in product(FACES, repeat=mode):
+        mask = tuple(i for i in range(mode) if chosen[i] != roll[i])
+        mask_counts[mask] = mask_counts.get(mask, 0) + 1
+
+    # Cada relanzamiento de k dados pesa 6^(mode-k) sobre el denominador 6^(2*mode)
+    for mask, n_rolls in mask_counts.items():
+        weight = n_rolls * 6 ** (mode - len(mask))
+        final_roll = list(chosen)
+        for reroll in product(FACES, repeat=len(mask)):
+            for i, value in zip(mask, reroll):
+                final_roll[i] = value
+            counts[prize_text(mode, match_fn(chosen, final_roll))] += weight
+    return counts, 6 ** (2 * mode)
+
+def exact_distribution(mode=2, rule="original", bonus=False, chosen=None):
+    """
+    Distribución exacta de premios para (modo, regla, bonus).
+      - chosen: elección del jugador; por defecto (1, ..., mode). Con números sin
+        repetir la distribución no depende de cuáles se elijan.
+    Devuelve dict ordenado etiqueta -> Fraction (suma exactamente 1).
+    Los resultados quedan memorizados por proceso.
+    """
+    chosen = tuple(range(1, mode + 1)) if chosen is None else tuple(chosen)
+    if len(chosen) != mode:
+        raise ValueError(f"Se esperaban {mode} números elegidos, se recibieron {len(chosen)}")
+    counts, total = _exact_counts(chosen, rule, bonus)
+    return {label: Fraction(c, total) for label, c in counts.items()}
+
+def theoretical(mode=2, rule="original", bonus=False):
+    """Igual que `exact_distribution` pero en float, para mostrar al usuario."""
+    return {label: float(p) for label, p in exact_distribution(mode, rule, bonus).items()}
@@ -0,0 +1,87 @@
+"""
+dados_fortuna_general.py
+Distribuciones exactas de "Los dados de la fortuna" para n dados de f caras.
+
+`dados_fortuna_exact` enumera las f^n tiradas, lo que deja de ser viable a
+partir de unos 8 dados. Aquí las distribuciones de aciertos se obtienen en
+forma cerrada (tiempo polinomial en n) y se agrupan con escalones de premio
+configurables (`Main.default_prize_tiers` por defecto):
+
+ - original, sin bonus: cada posición acierta con prob. 1/f -> Binomial(n, 1/f).
+ - original, con bonus: una posición acierta de entrada o al relanzarla
+   -> Binomial(n, 1/f + (1 - 1/f) / f).
+ - orden libre, sin bonus: inclusión-exclusión sobre los k números elegidos;
+   P(aparecen exactamente j) = C(k, j) * sum_i (-1)^i C(j, i) ((f - k + j - i) / f)^n.
+ - orden libre, con bonus: `apply_bonus` relanza por posición, así que con a
+   aciertos posicionales (Binomial(n, 1/f)) quedan n - a dados nuevos y n - a
+   números por encontrar; el total es a + J con J de la fórmula anterior.
+
+Todo se calcula con `Fraction`; para n = 2 y 4 con 6 caras coincide con
+`dados_fortuna_exact.exact_distribution`.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+from dados_fortuna_core import default_prize_tiers, prize_from_tiers
+
+# -------------------------
+# Distribuciones de aciertos
+# -------------------------
+def _binomial(n, p):
+    """Lista P(X = j), j = 0..n, para X ~ Binomial(n, p) con p Fraction."""
+    q = 1 - p
+    return [comb(n, j) * p ** j * q ** (n - j) for j in range(n + 1)]
+
+@lru_cache(maxsize=None)
+def order_free_distribution(n_dice, faces, n_chosen):
+    """
+    Distribución (tupla de Fraction, índice = aciertos) de cuántos de `n_chosen`
+    números distintos aparecen al menos una vez en `n_dice` dados de `faces` caras.
+    """
+    if n_chosen > faces:
+        raise ValueError(f"No se pueden elegir {n_chosen} números distintos con {faces} caras")
+    total = faces ** n_dice
+    dist = []
+    for j in range(n_chosen + 1):
+        # j números concretos presentes y los otros n_chosen - j ausentes
+        ways = sum((-1) ** i * comb(j, i) * (faces - n_chosen + j - i) ** n_dice for i in range(j + 1))
+        dist.append(Fraction(comb(n_chosen, j) * ways, total))
+    return tuple(dist)
+
+@lru_cache(maxsize=None)
+def matches_distribution(n_dice=2, faces=6, rule="original", bonus=False):
+    """Distribución exacta (tupla de Fraction, índice = aciertos 0..n_dice) de los aciertos finales."""
+    if n_dice > faces:
+        raise ValueError(f"Se necesitan al menos {n_dice} caras para elegir {n_dice} números distintos")
+    p = Fraction(1, faces)
+    if rule == "original":
+        return tuple(_binomial(n_dice, p + (1 - p) * p if bonus else p))
+    if not bonus:
+        return order_free_distribution(n_dice, faces, n_dice)
+    dist = [Fraction(0)] * (n_dice + 1)
+    for a, p_a in enumerate(_binomial(n_dice, p)):
+        for j, p_j in enumerate(order_free_distribution(n_dice - a, faces, n_dice - a)):
+            dist[a + j] += p_a * p_j
+    return tuple(dist)
+
+# -------------------------
+# Distribución de premios
+# -------------------------
+def exact_distribution_general(n_dice=2, faces=6, rule="original", bonus=False, tiers=None):
+    """
+    Distribución exacta de premios para n dados de f caras.
+      - tiers: lista de (mínimo de aciertos, etiqueta) de mayor a menor;
+        por defecto `default_prize_tiers(n_dice)`.
+    Devuelve dict ordenado etiqueta -> Fraction (suma exactamente 1).
+    """
+    tiers = default_prize_tiers(n_dice) if tiers is None else tiers
+    result = {label: Fraction(0) for _, label in tiers}
+    for m, p in enumerate(matches_distribution(n_dice, faces, rule, bonus)):
+        result[prize_from_tiers(m, tiers)] += p
+    return result
+
+def theoretical_general(n_dice=2, faces=6, rule="original", bonus=False, tiers=None):
+    """Igual que `exact_distribution_general` pero en float, para mostrar al usuario."""
+    return {label: float(p) for label, p in exact_distribution_general(n_dice, faces, rule, bonus, tiers).items()}
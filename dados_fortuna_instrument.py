@@ -0,0 +1,194 @@
+"""
+dados_fortuna_instrument.py
+Instrumentación opcional de los caminos críticos de "Los dados de la fortuna".
+
+Desactivada no cuesta nada: las funciones originales no se tocan. Al activarla
+(`enable()` o variable de entorno) se reemplazan, en los módulos ya cargados,
+por envoltorios que cuentan llamadas y miden tiempo (total y máximo):
+roll_dice, funciones de aciertos, apply_bonus, single_game, play_round y los
+pasos `play` / `compute_results` / render de las GUIs. Al desactivarla se
+restauran los originales.
+
+Variables de entorno (leídas por `install_from_env`, que llaman los puntos de
+entrada: `Main.main` y los `__main__` de las GUIs):
+    DADOS_FORTUNA_INSTRUMENT=1          contadores; informe por stderr al salir
+    DADOS_FORTUNA_PROFILE=archivo.txt   cProfile de toda la corrida; informe al salir
+
+API: enable / disable / snapshot (métricas en vivo) / reset / report_text,
+y start_profile / stop_profile para el perfilador.
+"""
+
+import atexit
+import cProfile
+import functools
+import importlib
+import io
+import os
+import pstats
+import sys
+import time
+
+# (módulos, atributo): se envuelve el atributo en cada módulo cargado que lo tenga
+# (el núcleo y las reexportaciones de Main); "__main__" cubre los scripts
+# ejecutados directamente. Las métricas se agrupan por función original.
+CORE = ("dados_fortuna_core", "Main", "__main__")
+TARGETS = [
+    (CORE, "roll_dice"),
+    (CORE, "matches_original"),
+    (CORE, "matches_order_free"),
+    (CORE, "apply_bonus"),
+    (CORE, "single_game"),
+    (("dados_fortuna_kernels",), "matches_original"),
+    (("dados_fortuna_kernels",), "matches_order_free"),
+    (("dados_fortuna_round",), "play_round"),
+    (("dados_fortuna_batch",), "simulate_batch"),
+    (("dados_fortuna_gui", "dados_fortuna_2", "__main__"), "DadosFortunaApp.play"),
+    (("dados_fortuna_gui", "dados_fortuna_2", "__main__"), "DadosFortunaApp.compute_results"),
+    (("dados_fortuna_widgets",), "ChunkedTextRenderer.render"),
+    (("dados_fortuna_widgets",), "ChunkedTextRenderer._step"),
+]
+
+# módulos sin GUI que `install_from_env` importa de antemano: los scripts los
+# cargan de forma perezosa y quedarían sin instrumentar
+PRELOAD = ("dados_fortuna_core", "dados_fortuna_kernels", "dados_fortuna_batch", "dados_fortuna_round")
+
+_stats = {}      # nombre -> [llamadas, tiempo total, tiempo máximo]
+_patched = []    # (objeto, atributo, original)
+_profiler = None
+_exit_hooks = set()
+
+# -------------------------
+# Contadores
+# -------------------------
+def _wrap(name, fn):
+    stat = _stats.setdefault(name, [0, 0.0, 0.0])
+    perf = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = perf()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = perf() - start
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
+    return wrapper
+
+def _resolve(module, path):
+    """(objeto dueño, atributo) para "func" o "Clase.metodo"; None si no existe."""
+    owner = module
+    *parents, attr = path.split(".")
+    for part in parents:
+        owner = getattr(owner, part, None)
+    if owner is None or not callable(getattr(owner, attr, None)):
+        return None
+    return owner, attr
+
+def enabled():
+    return bool(_patched)
+
+def enable(targets=TARGETS):
+    """
+    Envuelve las funciones de `targets` en los módulos ya importados.
+    Se puede llamar de nuevo tras importar más módulos: sólo envuelve lo nuevo.
+    Devuelve la lista de nombres instrumentados.
+    """
+    done = {(id(owner), attr) for owner, attr, _ in _patched}
+    for modules, path in targets:
+        for module_name in modules:
+            module = sys.modules.get(module_name)
+            found = _resolve(module, path) if module is not None else None
+            if found is None or (id(found[0]), found[1]) in done:
+                continue
+            owner, attr = found
+            original = getattr(owner, attr)
+            name = f"{original.__module__}.{original.__qualname__}"
+            setattr(owner, attr, _wrap(name, original))
+            _patched.append((owner, attr, original))
+            done.add((id(owner), attr))
+    return sorted(_stats)
+
+def disable():
+    """Restaura las funciones originales (los contadores se conservan)."""
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+
+def reset():
+    """Pone a cero los contadores."""
+    for stat in _stats.values():
+        stat[:] = [0, 0.0, 0.0]
+
+def snapshot():
+    """Métricas en vivo: nombre -> {calls, total, mean, max} (tiempos en segundos)."""
+    return {
+        name: {"calls": calls, "total": total, "mean": total / calls if calls else 0.0, "max": worst}
+        for name, (calls, total, worst) in list(_stats.items())
+    }
+
+def report_text(sort_by="total"):
+    """Tabla legible de `snapshot()`, ordenada por `sort_by` (total, calls, mean o max)."""
+    rows = sorted(snapshot().items(), key=lambda item: item[1][sort_by], reverse=True)
+    lines = [f"{'función':50s} {'llamadas':>10s} {'total':>10s} {'media':>11s} {'máx':>11s}"]
+    for name, s in rows:
+        if s["calls"]:
+            lines.append(f"{name:50s} {s['calls']:>10,d} {s['total']:>9.3f}s "
+                         f"{s['mean'] * 1e6:>9.2f}us {s['max'] * 1e6:>9.2f}us")
+    return "\n".join(lines)
+
+# -------------------------
+# Perfilador
+# -------------------------
+def start_profile():
+    """Arranca cProfile para todo el proceso (sin efecto si ya está activo)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    return _profiler
+
+def stop_profile(path=None, sort_by="cumulative", limit=40):
+    """Detiene cProfile; escribe el informe en `path` (si se indica) y lo devuelve como texto."""
+    global _profiler
+    if _profiler is None:
+        return ""
+    _profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(_profiler, stream=out).sort_stats(sort_by).print_stats(limit)
+    _profiler = None
+    if path:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(out.getvalue())
+    return out.getvalue()
+
+# -------------------------
+# Activación por entorno
+# -------------------------
+def _report_at_exit():
+    if _stats:
+        print("\n" + report_text(), file=sys.stderr)
+
+def install_from_env(environ=os.environ):
+    """
+    Activa instrumentación / perfilador según DADOS_FORTUNA_INSTRUMENT y
+    DADOS_FORTUNA_PROFILE; sin ellas no hace nada. Se registra un informe al salir.
+    """
+    if environ.get("DADOS_FORTUNA_INSTRUMENT"):
+        for module_name in PRELOAD:
+            try:
+                importlib.import_module(module_name)
+            except ImportError:
+                pass  # p. ej. numpy no instalado
+        enable()
+        if "instrument" not in _exit_hooks:
+            atexit.register(_report_at_exit)
+            _exit_hooks.add("instrument")
+    profile_path = environ.get("DADOS_FORTUNA_PROFILE")
+    if profile_path:
+        start_profile()
+        if "profile" not in _exit_hooks:
+            atexit.register(stop_profile, profile_path)
+            _exit_hooks.add("profile")
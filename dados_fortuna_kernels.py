@@ -0,0 +1,122 @@
+"""
+dados_fortuna_kernels.py
+Núcleos de conteo de aciertos basados en tablas precalculadas.
+
+Las elecciones y tiradas se codifican como enteros pequeños:
+ - código base 6: (v1-1)*6^(n-1) + ... + (vn-1), en 0..6^n-1
+ - máscara de caras: bit v encendido si la cara v aparece (bits 1..6)
+
+Con eso los aciertos salen de una consulta de tabla:
+ - "original": tabla (código elegido, código tirada) -> aciertos por posición
+ - "order_free": popcount(máscara elegida & máscara tirada)
+
+`matches_original` / `matches_order_free` tienen la misma firma que las de
+Main.py y sirven como reemplazo directo; las versiones `*_batch` trabajan
+sobre arreglos de NumPy (matriz de caras o vector de códigos).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+FACES = 6
+MAX_TABLE_DICE = 4  # tabla (6^n x 6^n): 1.7 MB en modo 4
+
+_BIT = [1 << v for v in range(FACES + 1)]
+POPCOUNT = bytes(bin(m).count("1") for m in range(1 << (FACES + 1)))
+
+# -------------------------
+# Codificación
+# -------------------------
+def encode(values):
+    """Código base 6 de una elección o tirada (lista de caras 1..6)."""
+    code = 0
+    for v in values:
+        code = code * FACES + v - 1
+    return code
+
+def decode(code, n):
+    """Inverso de `encode`: lista de n caras."""
+    values = [0] * n
+    for i in range(n - 1, -1, -1):
+        code, digit = divmod(code, FACES)
+        values[i] = digit + 1
+    return values
+
+def face_mask(values):
+    """Máscara de 7 bits con el bit v encendido por cada cara v presente."""
+    mask = 0
+    for v in values:
+        mask |= _BIT[v]
+    return mask
+
+def encode_batch(rolls):
+    """Códigos base 6 de cada fila de una matriz (N x n) de caras."""
+    rolls = np.asarray(rolls)
+    n = rolls.shape[1]
+    powers = FACES ** np.arange(n - 1, -1, -1, dtype=np.int32)
+    return (rolls.astype(np.int32) - 1) @ powers
+
+# -------------------------
+# Tablas precalculadas (perezosas, una por número de dados)
+# -------------------------
+@lru_cache(maxsize=None)
+def _digits(n):
+    """Matriz (6^n x n) con las caras de cada código."""
+    codes = np.arange(FACES ** n)
+    return np.stack([(codes // FACES ** (n - 1 - i)) % FACES + 1 for i in range(n)], axis=1).astype(np.int8)
+
+@lru_cache(maxsize=None)
+def original_table(n):
+    """Tabla aplanada: `table[chosen_code * 6^n + roll_code]` = aciertos por posición."""
+    if n > MAX_TABLE_DICE:
+        raise ValueError(f"Tabla original sólo disponible hasta {MAX_TABLE_DICE} dados")
+    digits = _digits(n)
+    table = (digits[:, None, :] == digits[None, :, :]).sum(axis=2, dtype=np.uint8)
+    return table.tobytes()
+
+@lru_cache(maxsize=None)
+def mask_table(n):
+    """Arreglo código -> máscara de caras, para las 6^n tiradas posibles."""
+    return np.bitwise_or.reduce(np.left_shift(1, _digits(n).astype(np.int16)), axis=1)
+
+# -------------------------
+# Entradas escalares
+# -------------------------
+def matches_original_code(chosen_code, roll_code, n):
+    """Aciertos por posición a partir de códigos base 6."""
+    return original_table(n)[chosen_code * FACES ** n + roll_code]
+
+def matches_order_free_mask(chosen_mask, roll_mask):
+    """Aciertos en orden libre a partir de máscaras de caras."""
+    return POPCOUNT[chosen_mask & roll_mask]
+
+def matches_original(chosen, roll):
+    """Reemplazo directo de `Main.matches_original` (posición importa)."""
+    n = len(chosen)
+    if n > MAX_TABLE_DICE:
+        return sum(1 for c, r in zip(chosen, roll) if c == r)
+    return original_table(n)[encode(chosen) * FACES ** n + encode(roll)]
+
+def matches_order_free(chosen, roll):
+    """Reemplazo directo de `Main.matches_order_free` (orden libre)."""
+    return POPCOUNT[face_mask(chosen) & face_mask(roll)]
+
+# -------------------------
+# Entradas por lotes
+# -------------------------
+def _as_codes(rolls):
+    rolls = np.asarray(rolls)
+    return rolls if rolls.ndim == 1 else encode_batch(rolls)
+
+def matches_original_batch(chosen, rolls):
+    """Aciertos por posición para cada tirada (matriz N x n de caras o vector de códigos)."""
+    n = len(chosen)
+    table = np.frombuffer(original_table(n), dtype=np.uint8).reshape(FACES ** n, FACES ** n)
+    return table[encode(chosen)][_as_codes(rolls)]
+
+def matches_order_free_batch(chosen, rolls):
+    """Aciertos en orden libre para cada tirada (matriz N x n de caras o vector de códigos)."""
+    masks = mask_table(len(chosen))[_as_codes(rolls)]
+    popcount = np.frombuffer(POPCOUNT, dtype=np.uint8)
+    return popcount[masks & face_mask(chosen)]
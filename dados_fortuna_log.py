@@ -0,0 +1,148 @@
+"""
+dados_fortuna_log.py
+Bitácora binaria de juegos (solo anexar) con lector de acceso aleatorio.
+
+Formato del archivo:
+ - cabecera de 16 bytes: b"DFLOG", versión (u1), tamaño de registro (u2), relleno
+ - registros de tamaño fijo con RECORD_DTYPE (ver dados_fortuna_records)
+
+`GameLogWriter` anexa juegos de `single_game`, lotes de `simulate_batch` o
+registros ya empaquetados. `GameLogReader` abre el archivo con `np.memmap`:
+abrir es instantáneo sin importar el tamaño y las consultas (rebanadas, filtro
+por premio, agregados) recorren el archivo por bloques sin cargarlo en RAM.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from dados_fortuna_records import RECORD_DTYPE, game_to_record, record_to_game, records_from_batch
+from dados_fortuna_stats import GameStats
+from dados_fortuna_core import prize_labels
+
+MAGIC = b"DFLOG"
+VERSION = 1
+HEADER = struct.Struct("<5sBH8x")
+HEADER_SIZE = HEADER.size
+SCAN_CHUNK = 1 << 22  # registros por bloque al recorrer (40 MB)
+
+def _check_header(raw, path):
+    magic, version, record_size = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es una bitácora de juegos")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: versión {version} / registro de {record_size} bytes no soportados")
+
+# -------------------------
+# Escritura
+# -------------------------
+class GameLogWriter:
+    """Escritor solo-anexar; los juegos sueltos se acumulan y se escriben por bloques."""
+
+    def __init__(self, path, buffer_size=65536):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = []
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as fh:
+                _check_header(fh.read(HEADER_SIZE), path)
+        self._fh = open(path, "ab")
+        if not exists:
+            self._fh.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+
+    def append(self, game):
+        """Anexa un juego (dict de `single_game`)."""
+        self._buffer.append(game_to_record(game))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, games):
+        """Anexa todos los juegos de un iterable/generador."""
+        for game in games:
+            self.append(game)
+
+    def append_records(self, records):
+        """Anexa un arreglo con dtype RECORD_DTYPE."""
+        self.flush()
+        np.asarray(records, dtype=RECORD_DTYPE).tofile(self._fh)
+
+    def append_batch(self, batch):
+        """Anexa un lote de `simulate_batch`."""
+        self.append_records(records_from_batch(batch))
+
+    def flush(self):
+        if self._buffer:
+            np.array(self._buffer, dtype=RECORD_DTYPE).tofile(self._fh)
+            self._buffer.clear()
+        self._fh.flush()
+
+    def close(self):
+        if not self._fh.closed:
+            self.flush()
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# -------------------------
+# Lectura
+# -------------------------
+class GameLogReader:
+    """Lector de acceso aleatorio sobre `np.memmap`; `reader[i:j]` devuelve registros."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fh:
+            _check_header(fh.read(HEADER_SIZE), path)
+        n = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if n:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, key):
+        return self.records[key]
+
+    def game(self, i):
+        """Juego i como dict de `single_game`."""
+        return record_to_game(self.records[i])
+
+    def iter_chunks(self, chunk=SCAN_CHUNK):
+        """Recorre la bitácora por bloques de registros (vistas del memmap)."""
+        for start in range(0, len(self.records), chunk):
+            yield start, self.records[start:start + chunk]
+
+    def where_prize(self, label, chunk=SCAN_CHUNK):
+        """Índices de los juegos cuyo premio final es `label` (en cualquier modo)."""
+        targets = [(m, prize_labels(m).index(label)) for m in (2, 4) if label in prize_labels(m)]
+        found = []
+        for start, block in self.iter_chunks(chunk):
+            modes = block["flags"] >> 4
+            mask = np.zeros(len(block), dtype=bool)
+            for mode, index in targets:
+                mask |= (modes == mode) & (block["prize"] == index)
+            found.append(np.flatnonzero(mask) + start)
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def aggregate(self, chunk=SCAN_CHUNK):
+        """Un `GameStats` por modo con todos los juegos de la bitácora."""
+        stats = {}
+        for _, block in self.iter_chunks(chunk):
+            modes = block["flags"] >> 4
+            mode_values = np.unique(modes).tolist()
+            for mode in mode_values:
+                sel = block if len(mode_values) == 1 else block[modes == mode]
+                stats.setdefault(mode, GameStats(mode)).add_batch({
+                    "prize_index": sel["prize"],
+                    "matches_initial": sel["matches_initial"],
+                    "matches_final": sel["matches_final"],
+                })
+        return stats
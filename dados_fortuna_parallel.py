@@ -0,0 +1,96 @@
+"""
+dados_fortuna_parallel.py
+Simulación multinúcleo de "Los dados de la fortuna".
+
+Reparte un presupuesto de juegos entre varios procesos. Cada proceso recibe
+un flujo aleatorio independiente derivado de una única semilla maestra
+(`numpy.random.SeedSequence.spawn`), así que para una misma semilla y número
+de procesos los resultados agregados son idénticos bit a bit.
+
+Motores disponibles por proceso:
+ - "batch": `dados_fortuna_batch.simulate_batch` por bloques (rápido).
+ - "scalar": `Main.single_game` juego a juego (roll_dice, matches_*, apply_bonus).
+
+En Windows/macOS (spawn) la llamada debe hacerse bajo `if __name__ == "__main__":`.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dados_fortuna_core import single_game
+from dados_fortuna_batch import simulate_batch
+from dados_fortuna_rng import make_rng
+from dados_fortuna_stats import GameStats
+
+DEFAULT_CHUNK = 1_000_000
+
+# -------------------------
+# Trabajo de un proceso
+# -------------------------
+def _run_worker(task):
+    """
+    Ejecuta `n_games` juegos con la semilla hija recibida y devuelve su `GameStats`.
+    """
+    chosen, mode, rule, bonus, n_games, seed_seq, engine, chunk_size = task
+    stats = GameStats(mode)
+
+    if engine == "batch":
+        rng = np.random.default_rng(seed_seq)
+        remaining = n_games
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            stats.add_batch(simulate_batch(chosen, mode, rule, bonus, size, rng))
+            remaining -= size
+    elif engine == "scalar":
+        # Generador de dados propio por proceso, sembrado con la semilla hija
+        rng = make_rng("bits", int.from_bytes(seed_seq.generate_state(4, np.uint32).tobytes(), "little"))
+        stats.update(
+            single_game(list(chosen), mode=mode, rule=rule, apply_bonus_flag=bonus, rng=rng)
+            for _ in range(n_games)
+        )
+    else:
+        raise ValueError(f"Motor desconocido: {engine!r}")
+
+    return stats
+
+def split_budget(n_games, workers):
+    """Reparte `n_games` en `workers` partes lo más iguales posible (deterministas)."""
+    base, extra = divmod(n_games, workers)
+    return [base + (1 if i < extra else 0) for i in range(workers)]
+
+# -------------------------
+# Driver paralelo
+# -------------------------
+def simulate_parallel(chosen, mode=2, rule="original", bonus=False, n_games=1_000_000,
+                      workers=None, seed=None, engine="batch", chunk_size=DEFAULT_CHUNK):
+    """
+    Simula `n_games` juegos repartidos en `workers` procesos (por defecto, uno por núcleo).
+      - seed: semilla maestra (int). Si es None se genera una y se devuelve en el
+        resultado para poder reproducir la corrida.
+    Devuelve el resumen de `GameStats.as_dict()` (n_games, prize_counts,
+    matches_initial, matches_final, ...) más seed, workers y el acumulador
+    combinado en "stats".
+    """
+    workers = workers or os.cpu_count() or 1
+    master = np.random.SeedSequence(seed)
+    children = master.spawn(workers)
+    tasks = [
+        (tuple(chosen), mode, rule, bonus, n, child, engine, chunk_size)
+        for n, child in zip(split_budget(n_games, workers), children)
+    ]
+
+    if workers == 1:
+        partials = [_run_worker(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_run_worker, tasks))
+
+    # Se combinan en orden fijo de proceso para que el resultado sea reproducible
+    stats = GameStats(mode)
+    for partial in partials:
+        stats.merge(partial)
+    result = stats.as_dict()
+    result.update(seed=master.entropy, workers=workers, stats=stats)
+    return result
@@ -0,0 +1,203 @@
+"""
+dados_fortuna_policy.py
+Política óptima para el "Dado Bonus" proporcional de dados_fortuna_2.py.
+
+En esa GUI, tras la tirada inicial (comparación 'Original') con m aciertos,
+el jugador puede relanzar k de los mode - m dados no acertados. Cada dado
+relanzado acierta con probabilidad 1/6 y el puntaje final es
+    clamp(m + aciertos - fallos, 0, mode) = clamp(m + 2S - k, 0, mode),  S ~ Bin(k, 1/6).
+
+Con matemática binomial exacta (Fraction) se calcula el valor esperado del
+premio para cada (modo, m, k) y se guarda como tabla de política con el k
+óptimo. La GUI puede sugerirlo al instante y las simulaciones por lotes
+aplicarlo automáticamente (`simulate_proportional_batch`).
+
+El juego completo es una cadena de Markov de dos pasos: aciertos iniciales
+m ~ Bin(mode, 1/6) y, según la política (k por cada m), una matriz de
+transición m -> aciertos finales. `proportional_distribution` da la
+distribución exacta de premios para cualquier política; las matrices quedan
+en caché por (modo, política).
+
+Los valores por premio son configurables; por defecto se usa el rango del
+premio (Perdedor = 0, siguiente = 1, ...).
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels, prize_text
+from dados_fortuna_batch import prize_index_table
+from dados_fortuna_kernels import matches_original_batch
+
+P_HIT = Fraction(1, 6)
+
+def default_prize_values(mode):
+    """Valor ordinal por etiqueta: el peor premio vale 0 y cada escalón suma 1."""
+    labels = prize_labels(mode)
+    return {label: len(labels) - 1 - i for i, label in enumerate(labels)}
+
+def _values_key(mode, values):
+    values = default_prize_values(mode) if values is None else values
+    return tuple(Fraction(values[label]) for label in prize_labels(mode))
+
+# -------------------------
+# Matemática exacta
+# -------------------------
+@lru_cache(maxsize=None)
+def final_distribution(mode, matches_initial, k):
+    """Distribución exacta de aciertos finales (dict aciertos -> Fraction) al relanzar k dados."""
+    if not 0 <= k <= mode - matches_initial:
+        raise ValueError(f"k debe estar entre 0 y {mode - matches_initial}")
+    dist = {}
+    for s in range(k + 1):
+        p = comb(k, s) * P_HIT ** s * (1 - P_HIT) ** (k - s)
+        final = max(0, min(matches_initial + 2 * s - k, mode))
+        dist[final] = dist.get(final, 0) + p
+    return dist
+
+@lru_cache(maxsize=None)
+def _policy_table(mode, values_key):
+    value_of = dict(zip(prize_labels(mode), values_key))
+    table = {}
+    for m in range(mode + 1):
+        expected = {
+            k: sum(p * value_of[prize_text(mode, final)] for final, p in final_distribution(mode, m, k).items())
+            for k in range(mode - m + 1)
+        }
+        # En empate se prefiere relanzar menos dados
+        best_k = max(expected, key=lambda k: (expected[k], -k))
+        table[m] = {"best_k": best_k, "expected": expected}
+    return table
+
+def policy_table(mode, values=None):
+    """
+    Tabla de política para el modo: m -> {"best_k": k óptimo, "expected": {k: valor esperado}}.
+      - values: dict etiqueta -> valor del premio (por defecto `default_prize_values`).
+    Se calcula una vez por (modo, valores) y queda en caché.
+    """
+    return _policy_table(mode, _values_key(mode, values))
+
+def optimal_k(mode, matches_initial, values=None):
+    """Cantidad óptima de dados a relanzar (0 = no usar el Dado Bonus)."""
+    return policy_table(mode, values)[matches_initial]["best_k"]
+
+def expected_value(mode, matches_initial, k, values=None):
+    """Valor esperado exacto (Fraction) del premio al relanzar k dados."""
+    return policy_table(mode, values)[matches_initial]["expected"][k]
+
+# -------------------------
+# Cadena de Markov: aciertos iniciales -> k -> aciertos finales
+# -------------------------
+@lru_cache(maxsize=None)
+def initial_distribution(mode):
+    """Aciertos iniciales (comparación 'Original'): tupla de Fraction, Bin(mode, 1/6)."""
+    return tuple(comb(mode, m) * P_HIT ** m * (1 - P_HIT) ** (mode - m) for m in range(mode + 1))
+
+def policy_ks(mode, policy=None, values=None):
+    """
+    Normaliza una política a la tupla (k para m = 0..mode):
+      - None: la óptima de `policy_table(mode, values)`.
+      - int: relanzar hasta k dados (0 = nunca usar el Dado Bonus).
+      - dict m -> k (los m ausentes no relanzan) o secuencia de mode + 1 valores.
+    ValueError si algún k no está entre 0 y mode - m.
+    """
+    if policy is None:
+        table = policy_table(mode, values)
+        return tuple(table[m]["best_k"] for m in range(mode + 1))
+    if isinstance(policy, int):
+        return tuple(min(policy, mode - m) for m in range(mode + 1))
+    if isinstance(policy, dict):
+        ks = tuple(policy.get(m, 0) for m in range(mode + 1))
+    else:
+        ks = tuple(policy)
+    if len(ks) != mode + 1:
+        raise ValueError(f"La política debe tener {mode + 1} valores (uno por m), tiene {len(ks)}")
+    for m, k in enumerate(ks):
+        if not 0 <= k <= mode - m:
+            raise ValueError(f"Con {m} aciertos k debe estar entre 0 y {mode - m}, no {k}")
+    return ks
+
+@lru_cache(maxsize=None)
+def transition_matrix(mode, ks):
+    """
+    Matriz de transición exacta (tupla de filas de Fraction) para la política `ks`
+    (ver `policy_ks`): fila m = distribución de aciertos finales al relanzar ks[m] dados.
+    """
+    return tuple(
+        tuple(final_distribution(mode, m, k).get(f, Fraction(0)) for f in range(mode + 1))
+        for m, k in enumerate(ks)
+    )
+
+@lru_cache(maxsize=None)
+def _final_matches(mode, ks):
+    initial = initial_distribution(mode)
+    matrix = transition_matrix(mode, ks)
+    return tuple(sum(initial[m] * matrix[m][f] for m in range(mode + 1)) for f in range(mode + 1))
+
+def proportional_matches_distribution(mode, policy=None, values=None):
+    """Distribución exacta de aciertos finales (tupla de Fraction, índice = aciertos)."""
+    return _final_matches(mode, policy_ks(mode, policy, values))
+
+def proportional_distribution(mode, policy=None, values=None):
+    """
+    Distribución exacta de premios (etiqueta -> Fraction, en el orden de
+    `prize_labels`) del Dado Bonus proporcional con la política indicada
+    (por defecto la óptima, la que sugiere la GUI).
+    """
+    dist = dict.fromkeys(prize_labels(mode), Fraction(0))
+    for matches, p in enumerate(proportional_matches_distribution(mode, policy, values)):
+        dist[prize_text(mode, matches)] += p
+    return dist
+
+@lru_cache(maxsize=None)
+def _proportional_theoretical(mode, ks):
+    return {label: float(p) for label, p in proportional_distribution(mode, ks).items()}
+
+def proportional_theoretical(mode, policy=None, values=None):
+    """Igual que `proportional_distribution` pero en float, para mostrar (en caché)."""
+    return dict(_proportional_theoretical(mode, policy_ks(mode, policy, values)))
+
+# -------------------------
+# Aplicación por lotes
+# -------------------------
+def simulate_proportional_batch(chosen, mode=2, n_games=1, rng=None, values=None):
+    """
+    Simula `n_games` juegos con el Dado Bonus proporcional y la política óptima:
+    relanza los primeros k dados no acertados (como la GUI) y suma aciertos / resta fallos.
+    Devuelve dict de arreglos con las claves de `simulate_batch` más "k".
+    """
+    if len(chosen) != mode:
+        raise ValueError(f"Se esperaban {mode} números elegidos, se recibieron {len(chosen)}")
+    rng = np.random.default_rng() if rng is None else rng
+    chosen_arr = np.asarray(chosen, dtype=np.int8)
+
+    rolls = rng.integers(1, 7, size=(n_games, mode), dtype=np.int8)
+    matches_initial = matches_original_batch(chosen, rolls).astype(np.int8)
+
+    table = policy_table(mode, values)
+    best_k = np.array([table[m]["best_k"] for m in range(mode + 1)], dtype=np.int8)
+    k = best_k[matches_initial]
+
+    # Posiciones a relanzar: las primeras k no acertadas de cada fila
+    mismatch = rolls != chosen_arr
+    reroll_mask = mismatch & (np.cumsum(mismatch, axis=1) <= k[:, None])
+    rerolls = rng.integers(1, 7, size=(n_games, mode), dtype=np.int8)
+    final_rolls = np.where(reroll_mask, rerolls, rolls)
+
+    successes = (reroll_mask & (final_rolls == chosen_arr)).sum(axis=1, dtype=np.int8)
+    failures = k - successes
+    matches_final = np.clip(matches_initial + successes - failures, 0, mode).astype(np.int8)
+
+    return {
+        "chosen": list(chosen),
+        "roll_initial": rolls,
+        "matches_initial": matches_initial,
+        "applied_bonus": True,
+        "k": k,
+        "roll_final": final_rolls,
+        "matches_final": matches_final,
+        "prize_index": prize_index_table(mode)[matches_final],
+    }
@@ -0,0 +1,96 @@
+"""
+dados_fortuna_precision.py
+Simulación con precisión objetivo y parada automática.
+
+En lugar de fijar de antemano el número de juegos, `simulate_until_precision`
+simula una configuración (modo, regla, bonus) por bloques y se detiene en cuanto
+la semiamplitud del intervalo de Wilson de *cada* premio es menor que `tol`
+(absoluta, o relativa a la frecuencia del premio con `relative=True`),
+o cuando se agota el presupuesto de juegos o de tiempo.
+
+El tamaño de cada bloque se estima con la categoría más exigente:
+n ≈ z² p(1-p) / tol², con p la frecuencia observada (acotada por la regla de
+tres, 3/n, si aún no se ha visto ningún caso). Así no se simulan más juegos
+de los necesarios salvo un margen pequeño.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from dados_fortuna_batch import simulate_batch
+from dados_fortuna_stats import GameStats
+
+MIN_CHUNK = 10_000
+MAX_CHUNK = 5_000_000
+
+def _half_width(interval):
+    lo, hi = interval
+    return (hi - lo) / 2
+
+def _target(tol, stats, label, relative):
+    """Semiamplitud objetivo de una etiqueta (absoluta o relativa a su frecuencia)."""
+    return tol * stats.proportions()[label] if relative else tol
+
+def _trials_needed(stats, tol, z, relative=False):
+    """Estimación del total de juegos para que todas las categorías alcancen `tol`."""
+    needed = 0
+    for count in stats.prize_counts:
+        # Sin casos observados (o sin fallos) se usa la cota de la "regla de tres": 3/n
+        if count in (0, stats.n):
+            p = min(0.5, 3 / stats.n)
+        else:
+            p = count / stats.n
+        target = tol * p if relative else tol
+        needed = max(needed, math.ceil(z * z * p * (1 - p) / (target * target)))
+    return needed
+
+def simulate_until_precision(chosen, mode=2, rule="original", bonus=False, tol=1e-3, z=1.96,
+                             relative=False, max_games=None, max_seconds=None, rng=None):
+    """
+    Simula hasta que todas las etiquetas de premio tengan semiamplitud de Wilson < tol.
+      - tol: semiamplitud objetivo (probabilidad absoluta).
+      - relative: si True, `tol` es relativo a la frecuencia de cada premio
+        (semiamplitud < tol * p); útil para premios raros como el mayor de 4 dados.
+      - z: cuantil normal del nivel de confianza (1.96 -> 95%).
+      - max_games / max_seconds: presupuestos opcionales; el primero que se agote detiene la corrida.
+      - rng: `numpy.random.Generator` opcional.
+    Devuelve dict con stats (`GameStats`), n_games usados, reached (bool),
+    stop_reason ("precision", "max_games" o "max_seconds"), elapsed y
+    half_widths (etiqueta -> semiamplitud final).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    stats = GameStats(mode)
+    start = time.perf_counter()
+    chunk = MIN_CHUNK
+    stop_reason = None
+
+    while True:
+        if max_games is not None:
+            chunk = min(chunk, max_games - stats.n)
+        stats.add_batch(simulate_batch(chosen, mode, rule, bonus, chunk, rng))
+
+        intervals = stats.wilson_intervals(z)
+        if all(_half_width(ci) < _target(tol, stats, label, relative) for label, ci in intervals.items()):
+            stop_reason = "precision"
+        elif max_games is not None and stats.n >= max_games:
+            stop_reason = "max_games"
+        elif max_seconds is not None and time.perf_counter() - start >= max_seconds:
+            stop_reason = "max_seconds"
+        if stop_reason:
+            break
+
+        # Siguiente bloque: lo que falta según la categoría más exigente (+5% de margen),
+        # sin más que duplicar lo ya simulado (las estimaciones con pocos casos son ruidosas)
+        missing = _trials_needed(stats, tol, z, relative) * 1.05 - stats.n
+        chunk = int(min(MAX_CHUNK, stats.n, max(MIN_CHUNK, missing)))
+
+    return {
+        "stats": stats,
+        "n_games": stats.n,
+        "reached": stop_reason == "precision",
+        "stop_reason": stop_reason,
+        "elapsed": time.perf_counter() - start,
+        "half_widths": {label: _half_width(ci) for label, ci in intervals.items()},
+    }
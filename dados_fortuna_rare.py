@@ -0,0 +1,255 @@
+"""
+dados_fortuna_rare.py
+Estimadores con reducción de varianza para premios raros.
+
+Con muestreo simple, estimar p = 1/1296 (premio mayor de 4 dados, regla
+original) con error relativo del 1% requiere del orden de 10^7 juegos. Los
+estimadores de este módulo reciben el mismo presupuesto de juegos y devuelven
+la estimación junto con su varianza y la ganancia ("speedup") respecto del
+muestreo simple: cuántas veces más juegos necesitaría éste para la misma
+varianza, p(1-p) / (n * Var).
+
+ - `importance_sampling`: dados sesgados hacia el número elegido en su
+   posición (regla original) o hacia cualquier número elegido (orden libre),
+   con pesos de verosimilitud por dado.
+ - `stratified`: estratos por aciertos posicionales iniciales a ~ Binomial(mode, 1/6)
+   (probabilidades exactas), muestreo condicionado dentro de cada estrato y
+   asignación de Neyman a partir de una muestra piloto.
+ - `conditional_bonus`: Monte Carlo condicional de la etapa `apply_bonus`;
+   se simula sólo la tirada inicial y se promedia la probabilidad exacta del
+   premio dado a (el relanzamiento por posición sólo depende de a).
+
+El evento es una etiqueta de premio (`prize_labels(mode)`, por defecto el premio mayor).
+"""
+
+import math
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels, prize_text
+from dados_fortuna_batch import batch_matches, simulate_batch
+from dados_fortuna_general import matches_distribution, order_free_distribution
+
+FACES = 6
+BIAS_GRID = (0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+PILOT_GAMES = 2_000
+PILOT_PER_STRATUM = 2_000
+
+# -------------------------
+# Utilidades
+# -------------------------
+def _event_table(mode, label):
+    """Arreglo booleano aciertos (0..mode) -> el premio final es `label`."""
+    label = prize_labels(mode)[0] if label is None else label
+    if label not in prize_labels(mode):
+        raise ValueError(f"Premio desconocido para modo {mode}: {label!r}")
+    return np.array([prize_text(mode, m) == label for m in range(mode + 1)]), label
+
+def _result(name, label, estimate, variance, n_games, z=1.96):
+    """Dict común a todos los estimadores (varianza del estimador, no por juego)."""
+    naive = estimate * (1 - estimate)
+    if variance > 0:
+        speedup = naive / (n_games * variance)
+    else:
+        speedup = math.inf if naive > 0 else 1.0
+    se = math.sqrt(variance)
+    return {
+        "method": name,
+        "label": label,
+        "estimate": estimate,
+        "variance": variance,
+        "std_error": se,
+        "interval": (estimate - z * se, estimate + z * se),
+        "n_games": n_games,
+        "speedup": speedup,
+    }
+
+def _proposal(chosen, rule, q):
+    """
+    Distribución sesgada de un dado (probabilidades de las caras 1..6 por posición)
+    y sus pesos de verosimilitud (1/6) / q_cara:
+      - "original": la cara chosen[i] con prob. q, las otras 5 con (1-q)/5.
+      - "order_free": cualquiera de los números elegidos con prob. q (repartida por
+        igual), las demás caras con 1-q.
+    """
+    mode = len(chosen)
+    probs = np.empty((mode, FACES))
+    for i in range(mode):
+        favoured = [chosen[i]] if rule == "original" else list(chosen)
+        for face in range(1, FACES + 1):
+            if face in favoured:
+                probs[i, face - 1] = q / len(favoured)
+            else:
+                probs[i, face - 1] = (1 - q) / (FACES - len(favoured))
+    return probs, (1 / FACES) / probs
+
+def _biased_roll(probs, n_games, rng):
+    """Tiradas (n_games x mode) donde el dado i sigue la distribución probs[i]."""
+    cdf = probs.cumsum(axis=1)
+    u = rng.random((n_games, len(probs), 1))
+    return (1 + (u > cdf[None, :, :-1]).sum(axis=2)).astype(np.int8)
+
+# -------------------------
+# Muestreo simple (referencia)
+# -------------------------
+def naive(chosen, mode=2, rule="original", bonus=False, label=None, n_games=100_000, rng=None):
+    """Frecuencia empírica con `simulate_batch`; varianza p(1-p)/n."""
+    rng = np.random.default_rng() if rng is None else rng
+    event, label = _event_table(mode, label)
+    hits = event[simulate_batch(chosen, mode, rule, bonus, n_games, rng)["matches_final"]]
+    p = hits.mean()
+    return _result("naive", label, float(p), float(p * (1 - p) / n_games), n_games)
+
+# -------------------------
+# Muestreo por importancia
+# -------------------------
+def _importance_samples(chosen, rule, bonus, event, q, n_games, rng):
+    """Valores ponderados y = w * 1[premio] de `n_games` juegos con sesgo q."""
+    mode = len(chosen)
+    probs, ratio = _proposal(chosen, rule, q)
+    log_ratio = np.log(ratio)
+    positions = np.arange(mode)
+
+    rolls = _biased_roll(probs, n_games, rng)
+    log_w = log_ratio[positions, rolls - 1].sum(axis=1)
+    if bonus:
+        rerolls = _biased_roll(probs, n_games, rng)
+        mismatch = rolls != np.asarray(chosen, dtype=np.int8)
+        rolls = np.where(mismatch, rerolls, rolls)
+        log_w += np.where(mismatch, log_ratio[positions, rerolls - 1], 0.0).sum(axis=1)
+    return np.where(event[batch_matches(chosen, rolls, rule)], np.exp(log_w), 0.0)
+
+def tune_bias(chosen, rule, bonus, event, pilot=PILOT_GAMES, rng=None):
+    """
+    Elige q de `BIAS_GRID` con la menor varianza relativa en una corrida piloto
+    de `pilot` juegos por candidato. Sólo se prueban sesgos mayores que la
+    probabilidad sin sesgo (1/6, o mode/6 en orden libre).
+    Devuelve (q, juegos piloto usados).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    base = (1 if rule == "original" else len(chosen)) / FACES
+    candidates = [q for q in BIAS_GRID if q > base]
+    best_q, best_score = BIAS_GRID[-1], math.inf
+    for q in candidates:
+        y = _importance_samples(chosen, rule, bonus, event, q, pilot, rng)
+        if y.any() and y.var() / y.mean() ** 2 < best_score:
+            best_q, best_score = q, y.var() / y.mean() ** 2
+    return best_q, pilot * len(candidates)
+
+def importance_sampling(chosen, mode=2, rule="original", bonus=False, label=None,
+                        n_games=100_000, q=None, rng=None):
+    """
+    Muestreo por importancia con dados sesgados hacia los números elegidos
+    (ver `_proposal`); también los dados relanzados por el bonus.
+      - q: prob. de la cara favorecida por dado; por defecto se elige con `tune_bias`
+        (los juegos piloto cuentan dentro de `n_games`).
+    Cada juego pesa el producto de (1/6) / q_cara sobre todos los dados lanzados.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    event, label = _event_table(mode, label)
+    used = 0
+    if q is None:
+        q, used = tune_bias(chosen, rule, bonus, event, min(PILOT_GAMES, n_games // (4 * len(BIAS_GRID))), rng)
+    y = _importance_samples(chosen, rule, bonus, event, q, n_games - used, rng)
+    # la ganancia se mide sobre el presupuesto total, pilotos incluidos
+    result = _result("importance", label, float(y.mean()), float(y.var(ddof=1) / len(y)), n_games)
+    result["bias"] = q
+    return result
+
+# -------------------------
+# Estratificación
+# -------------------------
+def _stratum_rolls(chosen, a, n_games, rng):
+    """Tiradas con exactamente `a` aciertos posicionales (posiciones al azar)."""
+    mode = len(chosen)
+    chosen = np.asarray(chosen, dtype=np.int8)
+    # las a posiciones acertadas son las de menor clave aleatoria
+    keys = rng.random((n_games, mode))
+    hit = keys.argsort(axis=1).argsort(axis=1) < a
+    other = (chosen - 1 + rng.integers(1, FACES, size=hit.shape, dtype=np.int8)) % FACES + 1
+    return np.where(hit, chosen, other).astype(np.int8)
+
+def _stratum_hits(chosen, rule, bonus, event, a, n_games, rng):
+    rolls = _stratum_rolls(chosen, a, n_games, rng)
+    if bonus:
+        rerolls = rng.integers(1, FACES + 1, size=rolls.shape, dtype=np.int8)
+        rolls = np.where(rolls != np.asarray(chosen, dtype=np.int8), rerolls, rolls)
+    return event[batch_matches(chosen, rolls, rule)]
+
+def stratified(chosen, mode=2, rule="original", bonus=False, label=None,
+               n_games=100_000, pilot=PILOT_PER_STRATUM, rng=None):
+    """
+    Estratifica por aciertos posicionales iniciales a = 0..mode, con P(a) exacta.
+    Tras `pilot` juegos por estrato, el resto del presupuesto se reparte según
+    Neyman (n_a ∝ P(a) * desviación del estrato). Un estrato sin casos (o sin
+    fallos) en el piloto usa la cota de la regla de tres (3/n) para repartir,
+    salvo que el premio esté determinado por a (regla original sin bonus).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    event, label = _event_table(mode, label)
+    weights = [float(p) for p in matches_distribution(mode, FACES, "original", False)]
+    pilot = min(pilot, max(1, n_games // (mode + 1)))
+
+    hits = [_stratum_hits(chosen, rule, bonus, event, a, pilot, rng) for a in range(mode + 1)]
+    sd = []
+    for w, h in zip(weights, hits):
+        p = h.mean()
+        if p in (0, 1) and (bonus or rule != "original"):
+            p = 3 / len(h)
+        sd.append(w * math.sqrt(p * (1 - p)))
+    remaining = n_games - pilot * (mode + 1)
+    if remaining > 0 and sum(sd) > 0:
+        for a in range(mode + 1):
+            extra = int(remaining * sd[a] / sum(sd))
+            if extra:
+                hits[a] = np.concatenate([hits[a], _stratum_hits(chosen, rule, bonus, event, a, extra, rng)])
+
+    estimate = sum(w * h.mean() for w, h in zip(weights, hits))
+    variance = sum(w * w * h.var(ddof=1) / len(h) for w, h in zip(weights, hits) if len(h) > 1)
+    return _result("stratified", label, float(estimate), float(variance), sum(len(h) for h in hits))
+
+# -------------------------
+# Monte Carlo condicional
+# -------------------------
+def bonus_conditional_table(mode, rule, event):
+    """
+    P(premio final | a aciertos posicionales iniciales) con el bonus, a = 0..mode.
+    Los mode - a dados relanzados son nuevos: en la regla original suman
+    Binomial(mode - a, 1/6) aciertos; en orden libre, los que encuentren alguno
+    de los mode - a números aún ausentes (`order_free_distribution`).
+    """
+    table = []
+    for a in range(mode + 1):
+        if rule == "original":
+            extra = matches_distribution(mode - a, FACES, "original", False)
+        else:
+            extra = order_free_distribution(mode - a, FACES, mode - a)
+        table.append(float(sum(p for j, p in enumerate(extra) if event[a + j])))
+    return np.array(table)
+
+def conditional_bonus(chosen, mode=2, rule="original", label=None, n_games=100_000, rng=None):
+    """
+    Sustituye el relanzamiento por su probabilidad exacta condicionada a la tirada
+    inicial: sólo se lanzan los dados iniciales (regla "dado bonus").
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    event, label = _event_table(mode, label)
+    rolls = rng.integers(1, FACES + 1, size=(n_games, mode), dtype=np.int8)
+    a = (rolls == np.asarray(chosen, dtype=np.int8)).sum(axis=1)
+    y = bonus_conditional_table(mode, rule, event)[a]
+    return _result("conditional", label, float(y.mean()), float(y.var(ddof=1) / n_games), n_games)
+
+# -------------------------
+# Comparación
+# -------------------------
+def compare_estimators(chosen, mode=2, rule="original", bonus=False, label=None, n_games=100_000, rng=None):
+    """Ejecuta todos los estimadores aplicables con el mismo presupuesto; dict método -> resultado."""
+    rng = np.random.default_rng() if rng is None else rng
+    results = {
+        "naive": naive(chosen, mode, rule, bonus, label, n_games, rng),
+        "importance": importance_sampling(chosen, mode, rule, bonus, label, n_games, rng=rng),
+        "stratified": stratified(chosen, mode, rule, bonus, label, n_games, rng=rng),
+    }
+    if bonus:
+        results["conditional"] = conditional_bonus(chosen, mode, rule, label, n_games, rng)
+    return results
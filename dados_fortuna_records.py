@@ -0,0 +1,120 @@
+"""
+dados_fortuna_records.py
+Representación compacta de juegos de "Los dados de la fortuna".
+
+Un juego de `single_game` (dict con listas) ocupa cerca de 1 KB en Python.
+Aquí se empaqueta en:
+ - RECORD_DTYPE: registro estructurado de NumPy de 10 bytes, o
+ - un entero de ancho fijo (`pack_game`, 49 bits).
+
+Elección y tiradas se guardan como códigos base 6 (ver dados_fortuna_kernels),
+los aciertos como enteros pequeños y el premio como índice en `prize_labels(mode)`.
+El campo `flags` guarda el modo (bits 4-7) y si se aplicó el bonus (bit 0).
+"""
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels
+from dados_fortuna_kernels import decode, encode, encode_batch
+
+RECORD_DTYPE = np.dtype([
+    ("chosen", "<u2"),
+    ("roll_initial", "<u2"),
+    ("roll_final", "<u2"),
+    ("matches_initial", "u1"),
+    ("matches_final", "u1"),
+    ("prize", "u1"),
+    ("flags", "u1"),
+])
+
+# Disposición del entero empaquetado: (campo, ancho en bits), del bit menos significativo al más
+PACKED_FIELDS = (
+    ("chosen", 11),
+    ("roll_initial", 11),
+    ("roll_final", 11),
+    ("matches_initial", 3),
+    ("matches_final", 3),
+    ("prize", 2),
+    ("flags", 8),
+)
+
+# -------------------------
+# Flags
+# -------------------------
+def make_flags(mode, applied_bonus):
+    """Combina modo y bonus en un byte."""
+    return (mode << 4) | int(bool(applied_bonus))
+
+def split_flags(flags):
+    """Inverso de `make_flags`: (mode, applied_bonus)."""
+    return int(flags) >> 4, bool(flags & 1)
+
+# -------------------------
+# Juego (dict) <-> registro
+# -------------------------
+def game_to_record(game):
+    """Tupla de campos de RECORD_DTYPE para un dict de `single_game`."""
+    mode = len(game["chosen"])
+    return (
+        encode(game["chosen"]),
+        encode(game["roll_initial"]),
+        encode(game["roll_final"]),
+        game["matches_initial"],
+        game["matches_final"],
+        prize_labels(mode).index(game["prize"]),
+        make_flags(mode, game["applied_bonus"]),
+    )
+
+def record_to_game(record):
+    """Reconstruye el dict de `single_game` a partir de un registro (o tupla de campos)."""
+    if isinstance(record, np.void):
+        record = record.item()
+    chosen, roll_initial, roll_final, matches_initial, matches_final, prize, flags = (int(x) for x in record)
+    mode, applied_bonus = split_flags(flags)
+    return {
+        "chosen": decode(chosen, mode),
+        "roll_initial": decode(roll_initial, mode),
+        "matches_initial": matches_initial,
+        "applied_bonus": applied_bonus,
+        "roll_final": decode(roll_final, mode),
+        "matches_final": matches_final,
+        "prize": prize_labels(mode)[prize],
+    }
+
+def records_from_games(games):
+    """Arreglo estructurado a partir de un iterable de dicts de `single_game`."""
+    return np.fromiter((game_to_record(g) for g in games), dtype=RECORD_DTYPE)
+
+def records_from_batch(batch):
+    """Arreglo estructurado a partir de un lote de `simulate_batch`."""
+    mode = len(batch["chosen"])
+    n = len(batch["matches_final"])
+    records = np.empty(n, dtype=RECORD_DTYPE)
+    records["chosen"] = encode(batch["chosen"])
+    records["roll_initial"] = encode_batch(batch["roll_initial"])
+    records["roll_final"] = encode_batch(batch["roll_final"])
+    records["matches_initial"] = batch["matches_initial"]
+    records["matches_final"] = batch["matches_final"]
+    records["prize"] = batch["prize_index"]
+    records["flags"] = make_flags(mode, batch["applied_bonus"])
+    return records
+
+# -------------------------
+# Entero de ancho fijo
+# -------------------------
+def pack_game(game):
+    """Empaqueta un dict de `single_game` en un entero."""
+    packed = 0
+    shift = 0
+    for (_, width), value in zip(PACKED_FIELDS, game_to_record(game)):
+        packed |= value << shift
+        shift += width
+    return packed
+
+def unpack_game(packed):
+    """Inverso de `pack_game`."""
+    fields = []
+    for _, width in PACKED_FIELDS:
+        fields.append(packed & ((1 << width) - 1))
+        packed >>= width
+    return record_to_game(fields)
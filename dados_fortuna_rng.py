@@ -0,0 +1,144 @@
+"""
+dados_fortuna_rng.py
+Generadores de dados intercambiables para las funciones de juego.
+
+`random.randint(1, 6)` cuesta varias llamadas de Python por dado. Los
+backends de este módulo entregan dados desde un búfer de bytes
+pregenerado y sólo se recargan cada BUFFER_SIZE caras:
+
+ - "random": referencia, `random.Random.randint` dado a dado (mismo
+   comportamiento que el código original).
+ - "bits": `random.Random.getrandbits` en bloques grandes; cada byte < 252
+   se convierte en cara con `bytes.translate` (rechazo sin sesgo) y los
+   rechazados se descartan.
+ - "numpy": `numpy.random.Generator.integers` llena el búfer de una vez
+   (NumPy se importa sólo al crear este backend).
+
+Todos aceptan `seed` y son deterministas con la misma semilla y backend.
+Interfaz común: `die(faces)`, `roll(n, faces)` y `sample(population, k)`.
+"""
+
+import random
+
+BUFFER_SIZE = 1 << 16
+BACKENDS = ("random", "bits", "numpy")
+
+# -------------------------
+# Backends
+# -------------------------
+class RandomDice:
+    """Backend de referencia: un `randint` por dado, como `Main.roll_dice` original."""
+
+    name = "random"
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+
+    def die(self, faces=6):
+        return self.random.randint(1, faces)
+
+    def roll(self, n, faces=6):
+        randint = self.random.randint
+        return [randint(1, faces) for _ in range(n)]
+
+    def sample(self, population, k):
+        return self.random.sample(population, k)
+
+class BufferedDice(RandomDice):
+    """
+    Base de los backends con búfer: mantiene, por número de caras, un `bytes`
+    de caras ya generadas y la posición de lectura.
+    """
+
+    def __init__(self, seed=None, buffer_size=BUFFER_SIZE):
+        super().__init__(seed)
+        self.buffer_size = buffer_size
+        self._buffers = {}  # caras -> [bytes, posición]
+
+    def _fill(self, faces):
+        """Devuelve un `bytes` nuevo con caras 1..faces (lo implementa cada backend)."""
+        raise NotImplementedError
+
+    def die(self, faces=6):
+        return self.roll(1, faces)[0]
+
+    def roll(self, n, faces=6):
+        state = self._buffers.get(faces)
+        if state is None:
+            state = self._buffers[faces] = [b"", 0]
+        buf, pos = state
+        if pos + n > len(buf):
+            # se conserva el resto no usado para no desperdiciar caras
+            buf = buf[pos:]
+            while len(buf) < n:
+                buf += self._fill(faces)
+            pos = 0
+            state[0] = buf
+        state[1] = pos + n
+        return list(buf[pos:pos + n])
+
+class BitsDice(BufferedDice):
+    """Caras a partir de `getrandbits`: un byte por intento, rechazo de los bytes >= 252 (para 6 caras)."""
+
+    name = "bits"
+    _tables = {}
+
+    @classmethod
+    def _table(cls, faces):
+        table = cls._tables.get(faces)
+        if table is None:
+            if not 1 <= faces <= 255:
+                raise ValueError(f"El backend 'bits' admite de 1 a 255 caras, no {faces}")
+            limit = 256 // faces * faces
+            # 0 marca un byte rechazado; el resto es byte % faces + 1
+            table = cls._tables[faces] = bytes(b % faces + 1 if b < limit else 0 for b in range(256))
+        return table
+
+    def _fill(self, faces):
+        raw = self.random.getrandbits(8 * self.buffer_size).to_bytes(self.buffer_size, "little")
+        return raw.translate(self._table(faces)).replace(b"\x00", b"")
+
+class NumpyDice(BufferedDice):
+    """Caras desde un `numpy.random.Generator` (también semilla de `sample`)."""
+
+    name = "numpy"
+
+    def __init__(self, seed=None, buffer_size=BUFFER_SIZE):
+        import numpy as np
+
+        super().__init__(seed, buffer_size)
+        self.generator = np.random.default_rng(seed)
+        self._dtype = np.uint8
+
+    def _fill(self, faces):
+        if not 1 <= faces <= 255:
+            raise ValueError(f"El backend 'numpy' admite de 1 a 255 caras, no {faces}")
+        return self.generator.integers(1, faces + 1, size=self.buffer_size, dtype=self._dtype).tobytes()
+
+# -------------------------
+# Fábrica y generador por defecto
+# -------------------------
+def make_rng(backend="bits", seed=None, **kwargs):
+    """Crea un generador de dados: backend "random", "bits" o "numpy"."""
+    classes = {"random": RandomDice, "bits": BitsDice, "numpy": NumpyDice}
+    if backend not in classes:
+        raise ValueError(f"Backend desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+    return classes[backend](seed, **kwargs)
+
+_default = None
+
+def get_default_rng():
+    """Generador compartido que usan las funciones de juego cuando no reciben `rng`."""
+    global _default
+    if _default is None:
+        _default = BitsDice()
+    return _default
+
+def set_default_rng(rng):
+    """Sustituye el generador por defecto (p. ej. `make_rng("bits", seed=1)` para reproducir)."""
+    global _default
+    _default = rng
+
+def seed(value=None, backend="bits"):
+    """Modo determinista: reemplaza el generador por defecto por uno con semilla."""
+    set_default_rng(make_rng(backend, value))
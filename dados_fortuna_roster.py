@@ -0,0 +1,282 @@
+"""
+dados_fortuna_roster.py
+Lista de jugadores escalable para las GUIs de "Los dados de la fortuna".
+
+ - `PlayerRoster`: modelo compacto sin widgets. Los nombres por defecto no se
+   guardan (None -> "Jugador i" según la posición, así renumerar es gratis) y
+   las elecciones viven en un único `bytearray` de mode bytes por jugador
+   (0 = casilla vacía).
+ - `RosterView`: vista virtualizada con barra de desplazamiento; sólo construye
+   widgets para las filas visibles y los reasigna al desplazarse.
+
+Importación masiva (`PlayerRoster.load_file`, formato de
+`dados_fortuna_round.read_players`): una línea por jugador, "Nombre; 1 2 3 4"
+o "Nombre,1,2,3,4". Las líneas vacías o que empiezan con '#' se ignoran; una
+línea sin números agrega al jugador con casillas vacías y cualquier otra debe
+traer tantos números como dados tiene el modo (si no, ValueError).
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from dados_fortuna_rng import get_default_rng
+
+DEFAULT_PREFIX = "Jugador "
+VISIBLE_ROWS = 8
+
+# -------------------------
+# Modelo
+# -------------------------
+class PlayerRoster:
+    """Jugadores (nombre + elección) en estructuras compactas."""
+
+    def __init__(self, mode=2):
+        self.mode = mode
+        self._names = []            # None = nombre por defecto según posición
+        self._choices = bytearray()  # mode bytes por jugador, 0 = vacío
+
+    def __len__(self):
+        return len(self._names)
+
+    # --- nombres ---
+    def name(self, i):
+        return self._names[i] or f"{DEFAULT_PREFIX}{i + 1}"
+
+    def set_name(self, i, text):
+        """Los nombres con formato por defecto ('Jugador X') siguen la numeración correlativa."""
+        self._names[i] = None if text.startswith(DEFAULT_PREFIX) else text
+
+    # --- elecciones ---
+    def choice(self, i):
+        """Lista de mode valores (0 = vacío)."""
+        start = i * self.mode
+        return list(self._choices[start:start + self.mode])
+
+    def set_value(self, i, j, value):
+        self._choices[i * self.mode + j] = value
+
+    def set_choice(self, i, values):
+        """`values` debe tener mode números, o ninguno (casillas vacías)."""
+        values = list(values) or [0] * self.mode
+        if len(values) != self.mode:
+            raise ValueError(f"Se esperaban {self.mode} números, se recibieron {len(values)}")
+        start = i * self.mode
+        self._choices[start:start + self.mode] = bytes(values)
+
+    # --- altas / bajas ---
+    def insert(self, index=None, name=None, choice=None):
+        """Inserta un jugador (al final si index es None) y devuelve su posición."""
+        index = len(self) if index is None or index > len(self) else index
+        self._names.insert(index, None if name is None or name.startswith(DEFAULT_PREFIX) else name)
+        start = index * self.mode
+        self._choices[start:start] = bytes(self.mode)
+        if choice is not None:
+            self.set_choice(index, choice)
+        return index
+
+    def delete(self, index):
+        del self._names[index]
+        start = index * self.mode
+        del self._choices[start:start + self.mode]
+
+    def clear(self):
+        self._names.clear()
+        self._choices.clear()
+
+    def set_mode(self, mode):
+        """Cambia la cantidad de dados conservando las primeras elecciones de cada jugador."""
+        if mode == self.mode:
+            return
+        old, old_mode = self._choices, self.mode
+        self.mode = mode
+        self._choices = bytearray(len(self) * mode)
+        keep = min(mode, old_mode)
+        for i in range(len(self)):
+            self._choices[i * mode:i * mode + keep] = old[i * old_mode:i * old_mode + keep]
+
+    def randomize(self, rng=None):
+        """Rellena todas las elecciones con números únicos aleatorios (rng: ver `dados_fortuna_rng`)."""
+        rng = rng or get_default_rng()
+        faces = range(1, 7)
+        self._choices = bytearray(v for _ in range(len(self)) for v in rng.sample(faces, self.mode))
+
+    # --- validación / importación ---
+    def entries(self):
+        """
+        Lista de (nombre, elección) validada.
+        Lanza ValueError con el mensaje "Entrada inválida para <nombre>: <motivo>".
+        """
+        entries = []
+        for i in range(len(self)):
+            chosen = self.choice(i)
+            if 0 in chosen:
+                reason = "Cantidad incorrecta de números"
+            elif len(set(chosen)) != len(chosen):
+                reason = "Números repetidos"
+            elif not all(1 <= x <= 6 for x in chosen):
+                reason = "Fuera de rango"
+            else:
+                entries.append((self.name(i).strip() or "Jugador", chosen))
+                continue
+            raise ValueError(f"Entrada inválida para {self.name(i)}: {reason}")
+        return entries
+
+    def load_file(self, path, replace=True):
+        """Importa jugadores desde un archivo de texto; devuelve cuántos se agregaron."""
+        from dados_fortuna_round import read_players
+
+        players = read_players(path)
+        # se valida antes de tocar la lista: un archivo erróneo no la vacía
+        for i, (name, values) in enumerate(players):
+            if len(values) not in (0, self.mode):
+                raise ValueError(f"Entrada inválida para {name or f'el jugador {i + 1}'}: "
+                                 f"se esperaban {self.mode} números, hay {len(values)}")
+        if replace:
+            self.clear()
+        for name, values in players:
+            self.insert(name=name, choice=values)
+        return len(players)
+
+# -------------------------
+# Vista virtualizada
+# -------------------------
+class RosterView:
+    """
+    Muestra `visible_rows` filas reutilizables sobre un `PlayerRoster`.
+      - show_add: si True cada fila tiene un botón '+' que inserta un jugador debajo.
+      - on_delete_last: callback si se intenta borrar el único jugador.
+    """
+
+    def __init__(self, parent, roster, visible_rows=VISIBLE_ROWS, show_add=False, on_delete_last=None, bg="#f5f5f5"):
+        self.roster = roster
+        self.visible_rows = visible_rows
+        self.show_add = show_add
+        self.on_delete_last = on_delete_last
+        self.bg = bg
+        self.first = 0
+        self._loading = False
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.frame.pack(fill="x")
+        self.rows_frame = tk.Frame(self.frame, bg=bg)
+        self.rows_frame.pack(side="left", fill="x", expand=True)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.count_label = tk.Label(parent, bg=bg, anchor="w")
+        self.count_label.pack(fill="x")
+
+        self._validate = (self.frame.register(self._valid_die), "%P")
+        self.rows = [self._build_row(r) for r in range(visible_rows)]
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.frame.bind_all(seq, self._on_wheel, add="+")
+        self.refresh()
+
+    # --- construcción de filas ---
+    @staticmethod
+    def _valid_die(text):
+        return text == "" or (len(text) == 1 and text in "123456")
+
+    def _build_row(self, r):
+        frame = tk.Frame(self.rows_frame, bg=self.bg, pady=3)
+        frame.grid(row=r, column=0, sticky="we")
+        name_var = tk.StringVar()
+        tk.Label(frame, text="Nombre:", bg=self.bg).pack(side="left", padx=(5, 2))
+        tk.Entry(frame, textvariable=name_var, width=14).pack(side="left", padx=(0, 10))
+        name_var.trace_add("write", lambda *a, r=r: self._on_name(r))
+
+        right_controls = tk.Frame(frame, bg=self.bg)
+        right_controls.pack(side="right", padx=5)
+        if self.show_add:
+            tk.Button(right_controls, text="+", fg="green", bg=self.bg, bd=0, width=2,
+                      command=lambda r=r: self._on_add(r)).pack(side="left", padx=(0, 4))
+        tk.Button(right_controls, text="✖", fg="red", bg=self.bg, bd=0, width=2,
+                  command=lambda r=r: self._on_delete(r)).pack(side="left")
+
+        dice_container = tk.Frame(frame, bg=self.bg)
+        dice_container.pack(side="left")
+        row = {"frame": frame, "name_var": name_var, "dice_container": dice_container, "dice_vars": []}
+        self._build_dice(row, r)
+        return row
+
+    def _build_dice(self, row, r):
+        for child in row["dice_container"].winfo_children():
+            child.destroy()
+        row["dice_vars"] = []
+        for j in range(self.roster.mode):
+            var = tk.StringVar()
+            var.trace_add("write", lambda *a, r=r, j=j: self._on_die(r, j))
+            row["dice_vars"].append(var)
+            ttk.Entry(row["dice_container"], textvariable=var, width=4, validate="key",
+                      validatecommand=self._validate).pack(side="left", padx=2)
+
+    def rebuild_dice(self):
+        """Recrea las casillas de dados tras un cambio de modo."""
+        for r, row in enumerate(self.rows):
+            self._build_dice(row, r)
+        self.refresh()
+
+    # --- sincronización modelo <-> widgets ---
+    def refresh(self):
+        """Vuelve a pintar las filas visibles desde el modelo."""
+        n = len(self.roster)
+        self.first = max(0, min(self.first, n - self.visible_rows))
+        self._loading = True
+        for r, row in enumerate(self.rows):
+            i = self.first + r
+            if i < n:
+                row["name_var"].set(self.roster.name(i))
+                for var, value in zip(row["dice_vars"], self.roster.choice(i)):
+                    var.set(str(value) if value else "")
+                row["frame"].grid()
+            else:
+                row["frame"].grid_remove()
+        self._loading = False
+        if n > self.visible_rows:
+            self.scrollbar.set(self.first / n, (self.first + self.visible_rows) / n)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{n} jugadores" if n > self.visible_rows else "")
+
+    def _on_name(self, r):
+        if not self._loading:
+            self.roster.set_name(self.first + r, self.rows[r]["name_var"].get())
+
+    def _on_die(self, r, j):
+        if not self._loading:
+            text = self.rows[r]["dice_vars"][j].get()
+            self.roster.set_value(self.first + r, j, int(text) if text else 0)
+
+    def _on_add(self, r):
+        self.roster.insert(self.first + r + 1)
+        if r + 1 >= self.visible_rows:
+            self.first += 1
+        self.refresh()
+
+    def _on_delete(self, r):
+        if len(self.roster) <= 1:
+            if self.on_delete_last:
+                self.on_delete_last()
+            return
+        self.roster.delete(self.first + r)
+        self.refresh()
+
+    # --- desplazamiento ---
+    def scroll_to(self, index):
+        self.first = index
+        self.refresh()
+
+    def yview(self, *args):
+        n = len(self.roster)
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.first += int(args[1]) * step
+        self.refresh()
+
+    def _on_wheel(self, event):
+        # bind_all recibe la rueda de toda la ventana: sólo se atiende sobre la lista
+        if not str(event.widget).startswith(str(self.frame)):
+            return
+        delta = -1 if (event.num == 4 or event.delta > 0) else 1
+        self.yview("scroll", delta, "units")
@@ -0,0 +1,157 @@
+"""
+dados_fortuna_round.py
+Motor de rondas multijugador (matricial) para "Los dados de la fortuna".
+
+En lugar de lanzar y contar jugador por jugador, `play_round` recibe las
+elecciones de todos los jugadores como una matriz (jugadores x dados), lanza
+todas las tiradas de una vez y calcula aciertos y premios con operaciones
+vectorizadas. Con `rounds` se juegan varias rondas (torneo) en la misma
+llamada, añadiendo un eje inicial a cada arreglo.
+
+El resultado es columnar (dict de arreglos, como `simulate_batch`);
+`iter_rows` lo convierte en dicts por jugador para la GUI y la CLI.
+
+Importación de jugadores (`read_players`): una línea por jugador,
+"Nombre; 1 2 3 4" o "Nombre,1,2,3,4"; se ignoran líneas vacías y las que
+empiezan con '#'.
+"""
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels
+from dados_fortuna_batch import prize_index_table
+from dados_fortuna_kernels import POPCOUNT
+
+FACES = 6
+_POPCOUNT = np.frombuffer(POPCOUNT, dtype=np.uint8)
+
+# -------------------------
+# Entrada
+# -------------------------
+def choice_matrix(choices, mode=None):
+    """
+    Matriz int8 (jugadores x dados) a partir de listas de elecciones.
+    Valida rango 1..6, cantidad y números repetidos (ValueError con el jugador 1-based).
+    """
+    if not isinstance(choices, np.ndarray):
+        for i, row in enumerate(choices):
+            if len(row) != (mode or len(choices[0])):
+                raise ValueError(f"Cantidad incorrecta de números para el jugador {i + 1}")
+    matrix = np.asarray(choices, dtype=np.int16)
+    if matrix.ndim != 2 or (mode is not None and matrix.shape[1] != mode):
+        raise ValueError(f"Se esperaba una matriz jugadores x {mode or 'dados'}, se recibió forma {matrix.shape}")
+    bad = ((matrix < 1) | (matrix > FACES)).any(axis=1)
+    if bad.any():
+        raise ValueError(f"Números fuera de rango para el jugador {int(bad.argmax()) + 1}")
+    ordered = np.sort(matrix, axis=1)
+    repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+    if repeated.any():
+        raise ValueError(f"Números repetidos para el jugador {int(repeated.argmax()) + 1}")
+    return matrix.astype(np.int8)
+
+def read_players(path):
+    """Lee un archivo de jugadores; devuelve lista de (nombre o None, lista de números)."""
+    players = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            sep = ";" if ";" in line else ","
+            name, _, rest = line.partition(sep)
+            values = [int(x) for x in rest.replace(",", " ").split()]
+            if any(not 1 <= v <= FACES for v in values):
+                raise ValueError(f"Números fuera de rango para {name.strip()}: {values}")
+            players.append((name.strip() or None, values))
+    return players
+
+# -------------------------
+# Núcleo vectorizado
+# -------------------------
+def _draw(rng, shape):
+    """Tiradas int8 con un `numpy.random.Generator` o un generador de `dados_fortuna_rng`."""
+    if hasattr(rng, "integers"):
+        return rng.integers(1, FACES + 1, size=shape, dtype=np.int8)
+    return np.array(rng.roll(int(np.prod(shape))), dtype=np.int8).reshape(shape)
+
+def _face_masks(values):
+    """Máscara de bits de caras por fila (último eje)."""
+    return np.bitwise_or.reduce(np.left_shift(1, values.astype(np.int16)), axis=-1)
+
+def round_matches(choices, rolls, rule="original"):
+    """
+    Aciertos por fila: `choices` (P x n) contra `rolls` (... x P x n).
+      - "original": coincidencia de valor y posición.
+      - "order_free": cuántos números elegidos aparecen al menos una vez.
+    """
+    if rule == "original":
+        return (rolls == choices).sum(axis=-1, dtype=np.int8)
+    return _POPCOUNT[_face_masks(choices) & _face_masks(rolls)].astype(np.int8)
+
+def play_round(choices, mode=None, rule="original", bonus=False, rng=None, rounds=None):
+    """
+    Juega una ronda (o `rounds` rondas) para todos los jugadores a la vez.
+      - choices: matriz o lista de listas (jugadores x dados), sin repetidos por fila.
+      - rule: "original" o "order_free"
+      - bonus: relanza una vez los dados que no coinciden por posición (`Main.apply_bonus`).
+      - rng: `numpy.random.Generator` o generador de `dados_fortuna_rng` (por defecto uno nuevo).
+      - rounds: None para una ronda; un entero añade un eje inicial de rondas.
+    Devuelve dict columnar: choices, roll_initial, matches_initial, applied_bonus,
+    roll_final, matches_final, prize_index y labels (`prize_labels(mode)`).
+    """
+    choices = choice_matrix(choices, mode)
+    mode = choices.shape[1]
+    rng = np.random.default_rng() if rng is None else rng
+    shape = choices.shape if rounds is None else (rounds,) + choices.shape
+
+    rolls = _draw(rng, shape)
+    matches_initial = round_matches(choices, rolls, rule)
+    if bonus:
+        final_rolls = np.where(rolls != choices, _draw(rng, shape), rolls)
+        matches_final = round_matches(choices, final_rolls, rule)
+    else:
+        final_rolls = rolls
+        matches_final = matches_initial
+
+    return {
+        "choices": choices,
+        "roll_initial": rolls,
+        "matches_initial": matches_initial,
+        "applied_bonus": bonus,
+        "roll_final": final_rolls,
+        "matches_final": matches_final,
+        "prize_index": prize_index_table(mode)[matches_final],
+        "labels": prize_labels(mode),
+    }
+
+# -------------------------
+# Salida por filas
+# -------------------------
+def iter_rows(result, names=None, first_round=1):
+    """
+    Convierte un resultado columnar en dicts por jugador con las claves de
+    `single_game` más "player" (1-based), "name" y, con varias rondas, "round"
+    (numerado desde `first_round`, para encadenar bloques de rondas).
+    """
+    labels = result["labels"]
+    choices = result["choices"].tolist()
+    names = names or [f"Jugador {i + 1}" for i in range(len(choices))]
+    multi = result["roll_initial"].ndim == 3
+    columns = [result[key] if multi else result[key][None]
+               for key in ("roll_initial", "matches_initial", "roll_final", "matches_final", "prize_index")]
+    for r, round_columns in enumerate(zip(*columns)):
+        rows = zip(choices, names, *(c.tolist() for c in round_columns))
+        for player, (chosen, name, roll, m_initial, roll_final, m_final, prize) in enumerate(rows):
+            row = {"round": first_round + r} if multi else {}
+            row.update({
+                "player": player + 1,
+                "name": name,
+                "chosen": chosen,
+                "roll_initial": roll,
+                "matches_initial": m_initial,
+                "applied_bonus": result["applied_bonus"],
+                "roll_final": roll_final,
+                "matches_final": m_final,
+                "prize": labels[prize],
+            })
+            yield row
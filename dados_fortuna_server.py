@@ -0,0 +1,352 @@
+"""
+dados_fortuna_server.py
+Servidor asyncio de "Los dados de la fortuna" con agrupación de peticiones.
+
+Protocolo: TCP local, una petición JSON por línea y una respuesta JSON por
+línea (en el mismo orden). Operaciones:
+
+    {"id": 1, "op": "play", "mode": 4, "rule": "original", "bonus": false, "chosen": [1, 2, 3, 4]}
+    {"id": 2, "op": "distribution", "mode": 4, "rule": "order_free", "bonus": true}
+    {"id": 3, "op": "stats"}
+
+"play" responde con las claves de `Main.single_game`; "distribution" con la
+distribución exacta (float y fracción "p/q"), memorizada por configuración.
+
+Agrupación: las jugadas concurrentes se encolan y un único bucle las junta
+(hasta MAX_BATCH o MAX_DELAY segundos) y las resuelve con una sola llamada a
+`play_round` por configuración (modo, regla, bonus).
+
+Uso:
+    python dados_fortuna_server.py serve --port 8765
+    python dados_fortuna_server.py load --port 8765 --clients 50 --requests 200
+    python dados_fortuna_server.py load --clients 50    # sin --port levanta un servidor en proceso
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from dados_fortuna_cache import cached_distribution
+from dados_fortuna_round import iter_rows, play_round
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BATCH = 4096
+MAX_DELAY = 0.002
+RULES = ("original", "order_free")
+
+# -------------------------
+# Validación y distribuciones
+# -------------------------
+def _config(request):
+    """(mode, rule, bonus) validados de una petición; ValueError si no son válidos."""
+    mode = request.get("mode", 2)
+    rule = request.get("rule", "original")
+    if mode not in (2, 4):
+        raise ValueError(f"Modo inválido: {mode!r} (2 o 4)")
+    if rule not in RULES:
+        raise ValueError(f"Regla inválida: {rule!r} ({' o '.join(RULES)})")
+    bonus = request.get("bonus", False)
+    if not isinstance(bonus, bool):
+        raise ValueError(f"'bonus' debe ser true o false, no {bonus!r}")
+    return mode, rule, bonus
+
+def _chosen(request, mode):
+    """Elección validada (lista de enteros 1..6, tantos como dados); ValueError si no es válida."""
+    chosen = request.get("chosen")
+    if not isinstance(chosen, list):
+        raise ValueError("Falta 'chosen' (lista de números)")
+    if len(chosen) != mode:
+        raise ValueError(f"'chosen' debe tener {mode} números, tiene {len(chosen)}")
+    for value in chosen:
+        # bool es subclase de int: se rechaza explícitamente
+        if type(value) is not int or not 1 <= value <= 6:
+            raise ValueError(f"Número inválido en 'chosen': {value!r} (enteros de 1 a 6)")
+    return chosen
+
+@lru_cache(maxsize=None)
+def distribution_payload(mode, rule, bonus):
+    """Respuesta de "distribution" (calculada una vez por configuración)."""
+    dist = cached_distribution(mode, rule, bonus)
+    return {
+        "mode": mode,
+        "rule": rule,
+        "bonus": bonus,
+        "probabilities": {label: float(p) for label, p in dist.items()},
+        "exact": {label: f"{p.numerator}/{p.denominator}" for label, p in dist.items()},
+    }
+
+# -------------------------
+# Agrupador de jugadas
+# -------------------------
+class PlayBatcher:
+    """
+    Junta jugadas concurrentes y las resuelve en lote con `play_round`.
+    `play` devuelve un futuro con el dict de la jugada.
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, max_delay=MAX_DELAY, seed=None):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.rng = np.random.default_rng(seed)
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.plays = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def play(self, config, chosen):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((config, chosen, future))
+        return future
+
+    async def _collect(self):
+        """Primera jugada (bloqueante) más todas las que lleguen dentro de `max_delay`."""
+        pending = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_delay
+        while len(pending) < self.max_batch:
+            try:
+                pending.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, self.max_delay / 4))
+        return pending
+
+    async def _run(self):
+        while True:
+            pending = await self._collect()
+            groups = {}
+            for item in pending:
+                groups.setdefault(item[0], []).append(item)
+            for (mode, rule, bonus), items in groups.items():
+                try:
+                    self._resolve(mode, rule, bonus, items)
+                except Exception as e:
+                    # un error inesperado falla sólo a este grupo; el bucle sigue vivo
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+            self.batches += 1
+            self.plays += len(pending)
+
+    def _resolve(self, mode, rule, bonus, items):
+        # una elección inválida no debe tumbar al resto del lote
+        try:
+            result = play_round([chosen for _, chosen, _ in items], mode, rule, bonus, self.rng)
+        except ValueError:
+            for _, chosen, future in items:
+                self._resolve_one(mode, rule, bonus, chosen, future)
+            return
+        for (_, _, future), row in zip(items, iter_rows(result)):
+            if not future.done():
+                del row["player"], row["name"]
+                future.set_result(row)
+
+    def _resolve_one(self, mode, rule, bonus, chosen, future):
+        try:
+            row = next(iter_rows(play_round([chosen], mode, rule, bonus, self.rng)))
+            del row["player"], row["name"]
+            future.set_result(row)
+        except ValueError as e:
+            future.set_exception(e)
+
+# -------------------------
+# Servidor
+# -------------------------
+class GameServer:
+    """Servidor JSON-lines; `start` abre el socket y `close` lo cierra."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, **batcher_kwargs):
+        self.host = host
+        self.port = port
+        self.batcher = PlayBatcher(**batcher_kwargs)
+        self.server = None
+        self.requests = 0
+        self._connections = set()
+
+    async def start(self):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        # conexiones que aún terminan de responder (los clientes ya cerraron)
+        if self._connections:
+            await asyncio.wait(self._connections, timeout=1.0)
+        await self.batcher.stop()
+
+    async def dispatch(self, request):
+        """Resuelve una petición ya decodificada y devuelve el dict de respuesta."""
+        self.requests += 1
+        if not isinstance(request, dict):
+            raise ValueError("La petición debe ser un objeto JSON")
+        op = request.get("op", "play")
+        if op == "play":
+            config = _config(request)
+            return await self.batcher.play(config, _chosen(request, config[0]))
+        if op == "distribution":
+            return distribution_payload(*_config(request))
+        if op == "stats":
+            batches = self.batcher.batches
+            return {"requests": self.requests, "plays": self.batcher.plays, "batches": batches,
+                    "mean_batch": self.batcher.plays / batches if batches else 0.0}
+        raise ValueError(f"Operación desconocida: {op!r}")
+
+    async def _answer(self, line):
+        request = {}
+        try:
+            request = json.loads(line)
+            response = {"ok": True, "result": await self.dispatch(request)}
+        except Exception as e:
+            # cualquier fallo se responde como error: la conexión y el servidor siguen vivos
+            response = {"ok": False, "error": str(e) or type(e).__name__}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def _handle(self, reader, writer):
+        # las respuestas se escriben en orden, pero varias peticiones de la misma
+        # conexión pueden estar en vuelo a la vez (y agruparse en el mismo lote)
+        responses = asyncio.Queue()
+        self._connections.add(asyncio.current_task())
+
+        async def write_loop():
+            while True:
+                task = await responses.get()
+                if task is None:
+                    break
+                writer.write((json.dumps(await task, ensure_ascii=False) + "\n").encode())
+                await writer.drain()
+
+        writer_task = asyncio.ensure_future(write_loop())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    responses.put_nowait(asyncio.ensure_future(self._answer(line)))
+        except ConnectionError:
+            pass
+        finally:
+            responses.put_nowait(None)
+            try:
+                await writer_task
+            except ConnectionError:
+                pass
+            writer.close()
+            self._connections.discard(asyncio.current_task())
+
+# -------------------------
+# Cliente de carga
+# -------------------------
+async def _client(host, port, n_requests, request, latencies, pipeline):
+    reader, writer = await asyncio.open_connection(host, port)
+    payload = (json.dumps(request) + "\n").encode()
+    sent = 0
+    received = 0
+    starts = []
+    while received < n_requests:
+        # hasta `pipeline` peticiones en vuelo por conexión
+        while sent < n_requests and sent - received < pipeline:
+            starts.append(time.perf_counter())
+            writer.write(payload)
+            sent += 1
+        await writer.drain()
+        line = await reader.readline()
+        latencies.append(time.perf_counter() - starts[received])
+        if not json.loads(line)["ok"]:
+            raise RuntimeError(f"Respuesta con error: {line!r}")
+        received += 1
+    writer.close()
+    await writer.wait_closed()
+
+async def load_test(host=DEFAULT_HOST, port=None, clients=50, requests=200, pipeline=1, request=None):
+    """
+    Lanza `clients` conexiones concurrentes con `requests` peticiones cada una.
+    Sin `port` levanta un servidor en el mismo proceso. Devuelve dict con
+    requests, elapsed, throughput (peticiones/s), p50/p99 de latencia (s) y las
+    estadísticas del servidor (tamaño medio de lote).
+    """
+    request = request or {"op": "play", "mode": 4, "rule": "original", "bonus": True, "chosen": [1, 2, 3, 4]}
+    server = None
+    if port is None:
+        server = await GameServer(host, 0).start()
+        port = server.port
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, requests, request, latencies, pipeline) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "stats"}\n')
+    stats = json.loads(await reader.readline())["result"]
+    writer.close()
+    await writer.wait_closed()
+    if server is not None:
+        await server.close()
+
+    p50, p99 = np.percentile(latencies, [50, 99]).tolist()
+    return {"requests": len(latencies), "elapsed": elapsed, "throughput": len(latencies) / elapsed,
+            "p50": p50, "p99": p99, "server": stats}
+
+# -------------------------
+# CLI
+# -------------------------
+async def serve(host, port):
+    server = await GameServer(host, port).start()
+    print(f"Sirviendo en {host}:{server.port} (Ctrl+C para salir)")
+    async with server.server:
+        await server.server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve", help="levantar el servidor")
+    p_serve.add_argument("--host", default=DEFAULT_HOST)
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_load = sub.add_parser("load", help="prueba de carga")
+    p_load.add_argument("--host", default=DEFAULT_HOST)
+    p_load.add_argument("--port", type=int, help="servidor existente (por defecto uno en proceso)")
+    p_load.add_argument("--clients", type=int, default=50)
+    p_load.add_argument("--requests", type=int, default=200, help="peticiones por cliente")
+    p_load.add_argument("--pipeline", type=int, default=1, help="peticiones en vuelo por conexión")
+    p_load.add_argument("--op", choices=["play", "distribution"], default="play")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    request = {"op": args.op, "mode": 4, "rule": "original", "bonus": True, "chosen": [1, 2, 3, 4]}
+    report = asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.pipeline, request))
+    print(f"{report['requests']:,} peticiones en {report['elapsed']:.2f} s "
+          f"-> {report['throughput']:,.0f} peticiones/s")
+    print(f"latencia p50 {report['p50'] * 1e3:.2f} ms | p99 {report['p99'] * 1e3:.2f} ms")
+    print(f"lote medio en el servidor: {report['server']['mean_batch']:.1f} jugadas")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""
+dados_fortuna_stats.py
+Acumulador de estadísticas de memoria constante para "Los dados de la fortuna".
+
+`GameStats` resume cualquier cantidad de juegos sin guardarlos: conteos por
+etiqueta de premio, histogramas de aciertos antes y después del bonus, media y
+varianza en línea de los aciertos finales, e intervalos de Wilson por premio.
+Se alimenta con dicts de `single_game` (uno a uno o desde un generador) o con
+lotes de `simulate_batch`, y los acumuladores parciales (p. ej. de procesos
+distintos) se combinan con `merge`.
+"""
+
+import math
+
+import numpy as np
+
+from dados_fortuna_core import prize_labels
+
+class GameStats:
+    """Resumen mergeable y de tamaño fijo de los juegos de un modo (2 o 4 dados)."""
+
+    def __init__(self, mode=2):
+        self.mode = mode
+        self.labels = prize_labels(mode)
+        self._index = {label: i for i, label in enumerate(self.labels)}
+        self.n = 0
+        self.prize_counts = [0] * len(self.labels)
+        self.hist_initial = [0] * (mode + 1)
+        self.hist_final = [0] * (mode + 1)
+        # Media y suma de cuadrados de desviaciones (Welford) de los aciertos finales
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    # -------------------------
+    # Alimentación
+    # -------------------------
+    def add(self, game):
+        """Agrega un juego (dict devuelto por `single_game`)."""
+        self.n += 1
+        self.prize_counts[self._index[game["prize"]]] += 1
+        self.hist_initial[game["matches_initial"]] += 1
+        x = game["matches_final"]
+        self.hist_final[x] += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        return self
+
+    def update(self, games):
+        """Agrega todos los juegos de un iterable/generador sin retenerlos."""
+        for game in games:
+            self.add(game)
+        return self
+
+    def add_batch(self, batch):
+        """Agrega un lote de `simulate_batch` (dict de arreglos)."""
+        final = np.asarray(batch["matches_final"])
+        n = len(final)
+        if n == 0:
+            return self
+        counts = np.bincount(batch["prize_index"], minlength=len(self.labels))
+        hist_initial = np.bincount(batch["matches_initial"], minlength=self.mode + 1)
+        hist_final = np.bincount(final, minlength=self.mode + 1)
+        batch_mean = float(final.mean())
+        batch_m2 = float(((final - batch_mean) ** 2).sum())
+        self._combine(n, counts.tolist(), hist_initial.tolist(), hist_final.tolist(), batch_mean, batch_m2)
+        return self
+
+    def merge(self, other):
+        """Combina otro acumulador del mismo modo en este (fórmula de Chan para la varianza)."""
+        if other.mode != self.mode:
+            raise ValueError(f"No se pueden combinar modos distintos ({self.mode} y {other.mode})")
+        if other.n:
+            self._combine(other.n, other.prize_counts, other.hist_initial, other.hist_final, other.mean, other._m2)
+        return self
+
+    def _combine(self, n, prize_counts, hist_initial, hist_final, mean, m2):
+        total = self.n + n
+        delta = mean - self.mean
+        self._m2 += m2 + delta * delta * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+        self.prize_counts = [a + int(b) for a, b in zip(self.prize_counts, prize_counts)]
+        self.hist_initial = [a + int(b) for a, b in zip(self.hist_initial, hist_initial)]
+        self.hist_final = [a + int(b) for a, b in zip(self.hist_final, hist_final)]
+
+    # -------------------------
+    # Consultas
+    # -------------------------
+    @property
+    def variance(self):
+        """Varianza muestral de los aciertos finales."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def proportions(self):
+        """Frecuencia empírica por etiqueta de premio."""
+        return {label: (c / self.n if self.n else 0.0) for label, c in zip(self.labels, self.prize_counts)}
+
+    def wilson_interval(self, label, z=1.96):
+        """Intervalo de confianza de Wilson (lo, hi) para la probabilidad de `label`."""
+        return wilson_interval(self.prize_counts[self._index[label]], self.n, z)
+
+    def wilson_intervals(self, z=1.96):
+        """Intervalos de Wilson para todas las etiquetas."""
+        return {label: self.wilson_interval(label, z) for label in self.labels}
+
+    def as_dict(self):
+        """Resumen serializable (conteos, histogramas, media y varianza)."""
+        return {
+            "n_games": self.n,
+            "prize_counts": dict(zip(self.labels, self.prize_counts)),
+            "matches_initial": list(self.hist_initial),
+            "matches_final": list(self.hist_final),
+            "mean_matches_final": self.mean,
+            "var_matches_final": self.variance,
+        }
+
+def wilson_interval(successes, n, z=1.96):
+    """Intervalo de Wilson para una proporción binomial (0..1 si n == 0)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    z2 = z * z
+    denom = 1 + z2 / n
+    center = (p + z2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
@@ -0,0 +1,335 @@
+"""
+dados_fortuna_validate.py
+Validación estadística de los motores de "Los dados de la fortuna" contra las
+distribuciones exactas.
+
+Para cada configuración (modo, regla, bonus) y cada motor se simulan juegos y
+se comparan los conteos por premio con `dados_fortuna_cache.cached_distribution`
+mediante las pruebas chi-cuadrado de Pearson y G (razón de verosimilitud).
+Motores:
+
+ - "scalar":   `single_game` juego a juego (generador "bits" con semilla).
+ - "kernels":  el mismo bucle con `dados_fortuna_kernels.matches_*` (tablas).
+ - "batch":    `dados_fortuna_batch.simulate_batch`.
+ - "round":    `dados_fortuna_round.play_round` con `rounds` rondas.
+ - "parallel": `dados_fortuna_parallel.simulate_parallel` (motor "batch", 2 procesos).
+ - "parallel_scalar": `simulate_parallel` con el motor "scalar".
+
+Las celdas corren en paralelo (un proceso por celda; las de "parallel*" lanzan
+su propio pool desde el proceso principal). Las semillas se derivan de una
+semilla maestra fija, así que el resultado es reproducible y se puede correr en
+cada cambio. Cada celda pasa si ambos p-valores superan alpha / (número de
+celdas) (corrección de Bonferroni); las celdas con esperados menores que
+MIN_EXPECTED se agrupan con la vecina.
+
+La cola chi-cuadrado usa la función gamma incompleta regularizada en Python
+puro (serie y fracción continua), sin depender de SciPy.
+
+Uso:
+    python dados_fortuna_validate.py                # matriz ok/FALLA con p-valores
+    python dados_fortuna_validate.py --quick        # 1/10 de los juegos (humo)
+    python dados_fortuna_validate.py --engines batch round --json resultado.json
+
+El código de salida es 1 si alguna celda falla.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dados_fortuna_cache import cached_distribution
+from dados_fortuna_core import prize_labels
+
+MODES = (2, 4)
+RULES = ("original", "order_free")
+DEFAULT_SEED = 20240601
+DEFAULT_ALPHA = 0.01
+MIN_EXPECTED = 5.0
+
+# juegos por celda y motor (los escalares son ~100x más lentos por juego)
+GAMES = {
+    "scalar": 30_000,
+    "kernels": 30_000,
+    "batch": 500_000,
+    "round": 500_000,
+    "parallel": 1_000_000,
+    "parallel_scalar": 60_000,
+}
+ENGINES = tuple(GAMES)
+POOLED = ("parallel", "parallel_scalar")  # lanzan su propio pool de procesos
+
+# -------------------------
+# Distribución chi-cuadrado (Python puro)
+# -------------------------
+_EPS = 1e-15
+_TINY = 1e-300
+_MAX_ITER = 10_000
+
+def gammaincc(a, x):
+    """
+    Función gamma incompleta superior regularizada Q(a, x) = Γ(a, x) / Γ(a).
+    Serie de P(a, x) para x < a + 1 y fracción continua (Lentz) en otro caso.
+    """
+    if a <= 0 or x < 0:
+        raise ValueError(f"Argumentos inválidos: a={a}, x={x}")
+    if x == 0:
+        return 1.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(_MAX_ITER):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * _EPS:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+    b = x + 1 - a
+    c = 1.0 / _TINY
+    d = 1.0 / b
+    h = d
+    for i in range(1, _MAX_ITER):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = d if abs(d) > _TINY else _TINY
+        c = b + an / c
+        c = c if abs(c) > _TINY else _TINY
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < _EPS:
+            break
+    return min(1.0, math.exp(log_prefactor) * h)
+
+def chi2_sf(stat, df):
+    """P(X >= stat) para X ~ chi-cuadrado con `df` grados de libertad."""
+    if df <= 0:
+        return 1.0
+    return gammaincc(df / 2, stat / 2)
+
+# -------------------------
+# Pruebas de bondad de ajuste
+# -------------------------
+def pool_cells(observed, probs, min_expected=MIN_EXPECTED):
+    """
+    Agrupa celdas consecutivas hasta que cada una tenga esperado >= `min_expected`
+    (el resto sobrante se une a la última). Devuelve (observados, esperados).
+    Las celdas de probabilidad 0 se omiten; si alguna tiene conteos, se
+    conserva con esperado 0 para que la prueba falle.
+    """
+    n = sum(observed)
+    cells_obs, cells_exp = [], []
+    acc_obs = acc_exp = 0.0
+    impossible = 0
+    for obs, p in zip(observed, probs):
+        if p == 0:
+            impossible += obs
+            continue
+        acc_obs += obs
+        acc_exp += n * float(p)
+        if acc_exp >= min_expected:
+            cells_obs.append(acc_obs)
+            cells_exp.append(acc_exp)
+            acc_obs = acc_exp = 0.0
+    if acc_exp or acc_obs:
+        if cells_exp:
+            cells_obs[-1] += acc_obs
+            cells_exp[-1] += acc_exp
+        else:
+            cells_obs.append(acc_obs)
+            cells_exp.append(acc_exp)
+    if impossible:
+        cells_obs.append(impossible)
+        cells_exp.append(0.0)
+    return cells_obs, cells_exp
+
+def chi_square_test(observed, probs):
+    """Chi-cuadrado de Pearson: (estadístico, grados de libertad, p-valor)."""
+    obs, exp = pool_cells(observed, probs)
+    if 0.0 in exp:
+        return math.inf, len(obs) - 1, 0.0
+    stat = sum((o - e) ** 2 / e for o, e in zip(obs, exp))
+    df = len(obs) - 1
+    return stat, df, chi2_sf(stat, df)
+
+def g_test(observed, probs):
+    """Prueba G (razón de verosimilitud): (estadístico, grados de libertad, p-valor)."""
+    obs, exp = pool_cells(observed, probs)
+    if 0.0 in exp:
+        return math.inf, len(obs) - 1, 0.0
+    stat = 2 * sum(o * math.log(o / e) for o, e in zip(obs, exp) if o > 0)
+    df = len(obs) - 1
+    return stat, df, chi2_sf(stat, df)
+
+# -------------------------
+# Motores
+# -------------------------
+def _scalar_counts(mode, rule, bonus, n_games, seed, kernels=False):
+    from dados_fortuna_core import apply_bonus, prize_text, roll_dice, single_game
+    from dados_fortuna_rng import make_rng
+
+    rng = make_rng("bits", seed)
+    chosen = list(range(1, mode + 1))
+    index = {label: i for i, label in enumerate(prize_labels(mode))}
+    counts = [0] * len(index)
+    if not kernels:
+        for _ in range(n_games):
+            counts[index[single_game(chosen, mode, rule, bonus, rng=rng)["prize"]]] += 1
+        return counts
+
+    from dados_fortuna_kernels import matches_order_free, matches_original
+
+    match_fn = matches_original if rule == "original" else matches_order_free
+    for _ in range(n_games):
+        roll = roll_dice(mode, rng=rng)
+        matches = match_fn(chosen, roll)
+        if bonus:
+            matches, _ = apply_bonus(chosen, roll, mode, match_fn, rng=rng)
+        counts[index[prize_text(mode, matches)]] += 1
+    return counts
+
+def engine_counts(engine, mode, rule, bonus, n_games, seed):
+    """Conteos por premio (en el orden de `prize_labels(mode)`) de `n_games` juegos del motor."""
+    chosen = list(range(1, mode + 1))
+    n_labels = len(prize_labels(mode))
+    if engine in ("scalar", "kernels"):
+        return _scalar_counts(mode, rule, bonus, n_games, seed, kernels=engine == "kernels")
+    if engine == "batch":
+        from dados_fortuna_batch import simulate_batch
+
+        batch = simulate_batch(chosen, mode, rule, bonus, n_games, np.random.default_rng(seed))
+        return np.bincount(batch["prize_index"], minlength=n_labels).tolist()
+    if engine == "round":
+        from dados_fortuna_round import play_round
+
+        result = play_round([chosen], mode, rule, bonus, np.random.default_rng(seed), rounds=n_games)
+        return np.bincount(result["prize_index"].ravel(), minlength=n_labels).tolist()
+    if engine in POOLED:
+        from dados_fortuna_parallel import simulate_parallel
+
+        inner = "scalar" if engine == "parallel_scalar" else "batch"
+        result = simulate_parallel(chosen, mode, rule, bonus, n_games, workers=2, seed=seed, engine=inner)
+        return [result["prize_counts"][label] for label in prize_labels(mode)]
+    raise ValueError(f"Motor desconocido: {engine!r} (opciones: {', '.join(ENGINES)})")
+
+# -------------------------
+# Celdas y matriz
+# -------------------------
+def configurations():
+    """Todas las configuraciones (modo, regla, bonus)."""
+    return [(mode, rule, bonus) for mode in MODES for rule in RULES for bonus in (False, True)]
+
+def config_name(mode, rule, bonus):
+    return f"{mode}/{rule}/{'bonus' if bonus else 'plain'}"
+
+def run_cell(task):
+    """Simula y prueba una celda (motor, modo, regla, bonus, juegos, semilla)."""
+    engine, mode, rule, bonus, n_games, seed = task
+    start = time.perf_counter()
+    counts = engine_counts(engine, mode, rule, bonus, n_games, seed)
+    dist = cached_distribution(mode, rule, bonus)
+    probs = [dist[label] for label in prize_labels(mode)]
+    chi2, df, chi2_p = chi_square_test(counts, probs)
+    g, _, g_p = g_test(counts, probs)
+    return {
+        "engine": engine,
+        "config": config_name(mode, rule, bonus),
+        "n_games": n_games,
+        "counts": counts,
+        "chi2": chi2,
+        "g": g,
+        "df": df,
+        "chi2_p": chi2_p,
+        "g_p": g_p,
+        "elapsed": time.perf_counter() - start,
+    }
+
+def validate(engines=ENGINES, seed=DEFAULT_SEED, alpha=DEFAULT_ALPHA, scale=1.0, workers=None):
+    """
+    Corre la matriz configuraciones x motores.
+      - scale: factor sobre `GAMES` (p. ej. 0.1 para una corrida rápida).
+      - alpha: nivel de la familia; cada celda usa alpha / número de celdas.
+    Devuelve dict con cells (lista de resultados con "passed"), alpha_cell,
+    passed y elapsed.
+    """
+    start = time.perf_counter()
+    tasks = []
+    configs = configurations()
+    seeds = np.random.SeedSequence(seed).spawn(len(engines) * len(configs))
+    for i, (engine, config) in enumerate((e, c) for e in engines for c in configs):
+        n_games = max(1, int(GAMES[engine] * scale))
+        tasks.append((engine, *config, n_games, int(seeds[i].generate_state(1)[0])))
+
+    local = [t for t in tasks if t[0] in POOLED]
+    remote = [t for t in tasks if t[0] not in POOLED]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(run_cell, t) for t in remote]
+        cells = [run_cell(t) for t in local]
+        cells = [f.result() for f in futures] + cells
+
+    alpha_cell = alpha / len(cells)
+    for cell in cells:
+        cell["passed"] = cell["chi2_p"] >= alpha_cell and cell["g_p"] >= alpha_cell
+    order = {(e, config_name(*c)): i for i, (e, c) in enumerate((e, c) for e in engines for c in configs)}
+    cells.sort(key=lambda cell: order[cell["engine"], cell["config"]])
+    return {
+        "cells": cells,
+        "alpha": alpha,
+        "alpha_cell": alpha_cell,
+        "seed": seed,
+        "passed": all(cell["passed"] for cell in cells),
+        "elapsed": time.perf_counter() - start,
+    }
+
+def format_matrix(report):
+    """Matriz configuración x motor con "ok"/"FALLA" y p-valores chi2/G."""
+    engines = list(dict.fromkeys(cell["engine"] for cell in report["cells"]))
+    by_key = {(cell["config"], cell["engine"]): cell for cell in report["cells"]}
+    width = 22
+    lines = [f"{'configuración':24s}" + "".join(f"{e:>{width}s}" for e in engines)]
+    for config in dict.fromkeys(cell["config"] for cell in report["cells"]):
+        row = f"{config:24s}"
+        for engine in engines:
+            cell = by_key[config, engine]
+            text = f"{'ok' if cell['passed'] else 'FALLA'} {cell['chi2_p']:.3f}/{cell['g_p']:.3f}"
+            row += f"{text:>{width}s}"
+        lines.append(row)
+    lines.append("")
+    lines.append(f"p-valores chi2/G; cada celda pasa si ambos >= {report['alpha_cell']:.2e} "
+                 f"(alpha {report['alpha']} / {len(report['cells'])} celdas, Bonferroni)")
+    verdict = "TODO OK" if report["passed"] else "HAY FALLAS"
+    lines.append(f"{verdict} en {report['elapsed']:.1f} s (semilla {report['seed']})")
+    return "\n".join(lines)
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="nivel de la familia de pruebas")
+    parser.add_argument("--quick", action="store_true", help="1/10 de los juegos por celda")
+    parser.add_argument("--scale", type=float, default=1.0, help="factor sobre los juegos por celda")
+    parser.add_argument("--workers", type=int, help="procesos (por defecto uno por núcleo)")
+    parser.add_argument("--json", metavar="ARCHIVO", help="guardar el informe completo")
+    args = parser.parse_args(argv)
+
+    scale = args.scale * (0.1 if args.quick else 1.0)
+    report = validate(args.engines, args.seed, args.alpha, scale, args.workers)
+    print(format_matrix(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+    return 0 if report["passed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+dados_fortuna_widgets.py
+Piezas de Tk compartidas por las GUIs de "Los dados de la fortuna".
+"""
+
+import tkinter as tk
+from itertools import islice
+
+RENDER_CHUNK_LINES = 200
+
+class ChunkedTextRenderer:
+    """
+    Escribe líneas en un `tk.Text` por bloques programados con `root.after`,
+    para que la ventana siga respondiendo con listas de jugadores grandes.
+    El primer bloque se inserta de inmediato; un nuevo `render` cancela el anterior.
+    """
+
+    def __init__(self, root, text_widget, chunk_lines=RENDER_CHUNK_LINES):
+        self.root = root
+        self.text = text_widget
+        self.chunk_lines = chunk_lines
+        self._job = None
+
+    def cancel(self):
+        """Detiene el render pendiente, si lo hay."""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def render(self, lines, clear=True):
+        """Programa la escritura de `lines` (iterable/generador de strings con su '\\n')."""
+        self.cancel()
+        if clear:
+            self.text.delete("1.0", tk.END)
+        self._step(iter(lines))
+
+    def _step(self, lines):
+        chunk = list(islice(lines, self.chunk_lines))
+        if chunk:
+            self.text.insert(tk.END, "".join(chunk))
+        if len(chunk) == self.chunk_lines:
+            self._job = self.root.after(1, self._step, lines)
+        else:
+            self._job = None